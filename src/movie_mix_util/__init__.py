@@ -1,43 +1,68 @@
 
-from .video_processing_lib import (
-    quick_mix,
-    quick_concatenate,
-    quick_crossfade,
-    VideoProcessor,
-    VideoSequenceBuilder,
-    VideoInfo,
-    VideoProcessingError
-)
-
-from .advanced_video_concatenator import (
-    CrossfadeEffect,
-    TransitionMode,
-    CrossfadeOutputMode,
-    create_crossfade_video
-)
-
-from .deferred_concat import (
-    movie,
-    DeferredVideoSequence
-)
-
-__all__ = [
+# サブモジュールは属性に初めてアクセスした時点で読み込む（PEP 562）。
+# 各サブモジュールはインポート時に common を通じてFFmpegのエンコーダ検出を行うため、
+# パッケージをインポートしただけでは実行しない。
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .video_processing_lib import (
+        quick_mix,
+        quick_concatenate,
+        quick_concat_and_mix,
+        quick_crossfade,
+        VideoProcessor,
+        VideoSequenceBuilder,
+        VideoInfo,
+        MixSpec,
+        VideoProcessingError
+    )
+    from .advanced_video_concatenator import (
+        CrossfadeEffect,
+        TransitionMode,
+        CrossfadeOutputMode,
+        create_crossfade_video
+    )
+    from .deferred_concat import (
+        movie,
+        DeferredVideoSequence
+    )
+
+_LAZY_ATTRIBUTES = {
     # video_processing_lib
-    "quick_mix",
-    "quick_concatenate",
-    "quick_crossfade",
-    "VideoProcessor",
-    "VideoSequenceBuilder",
-    "VideoInfo",
-    "VideoProcessingError",
+    "quick_mix": ".video_processing_lib",
+    "quick_concatenate": ".video_processing_lib",
+    "quick_concat_and_mix": ".video_processing_lib",
+    "quick_crossfade": ".video_processing_lib",
+    "VideoProcessor": ".video_processing_lib",
+    "VideoSequenceBuilder": ".video_processing_lib",
+    "VideoInfo": ".video_processing_lib",
+    "MixSpec": ".video_processing_lib",
+    "VideoProcessingError": ".video_processing_lib",
 
     # advanced_video_concatenator
-    "CrossfadeEffect",
-    "TransitionMode",
-    "CrossfadeOutputMode",
-    "create_crossfade_video",
+    "CrossfadeEffect": ".advanced_video_concatenator",
+    "TransitionMode": ".advanced_video_concatenator",
+    "CrossfadeOutputMode": ".advanced_video_concatenator",
+    "create_crossfade_video": ".advanced_video_concatenator",
 
     # deferred_concat
-    "movie",
-    "DeferredVideoSequence",
-]
+    "movie": ".deferred_concat",
+    "DeferredVideoSequence": ".deferred_concat",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
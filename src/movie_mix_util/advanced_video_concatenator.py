@@ -12,16 +12,33 @@ import ffmpeg
 import sys
 import os
 import argparse
+import tempfile
 from typing import List, Tuple, Literal, Union, Any
 from dataclasses import dataclass
 from enum import Enum
 
+from .common import (
+    DEFAULT_VIDEO_CODEC,
+    DEFAULT_PIXEL_FORMAT,
+    DEFAULT_HWACCEL,
+    get_ffmpeg_threads,
+    get_encoding_params,
+    get_x265_params,
+    ProgressCallback,
+    run_ffmpeg_args,
+    _output_option_args,
+    probe_video,
+    _find_missing_files
+)
+
 # 定数定義
 DEFAULT_VIDEO_WIDTH = 1920
 DEFAULT_VIDEO_HEIGHT = 1080
 DEFAULT_FPS = 30
-from .video_processing_lib import DEFAULT_VIDEO_CODEC, DEFAULT_PIXEL_FORMAT, DEFAULT_HWACCEL
 FRAME_DURATION = 0.033  # 1フレーム分の時間
+LAST_FRAME_WINDOW = 0.2  # 最後のフレームを探す末尾区間の長さ（コンテナの長さと最終フレームのずれを吸収）
+# ffprobeのH.264プロファイル名と libx264 の -profile:v の対応（クロスフェイド区間を動画本体に合わせる）
+X264_PROFILES = {'Constrained Baseline': 'baseline', 'Baseline': 'baseline', 'Main': 'main', 'High': 'high'}
 
 
 class TransitionMode(Enum):
@@ -88,6 +105,9 @@ class Transition:
 def get_video_duration(video_path: str) -> float:
     """動画の長さを取得する
     
+    ffprobeの結果はファイルごとにキャッシュされるため、同じ動画への
+    繰り返しの問い合わせではffprobeを起動しない。
+    
     Args:
         video_path: 動画ファイルのパス
         
@@ -95,7 +115,7 @@ def get_video_duration(video_path: str) -> float:
         float: 動画の長さ（秒）
     """
     try:
-        probe = ffmpeg.probe(video_path)
+        probe = probe_video(video_path)
         duration = float(probe['streams'][0]['duration'])
         return duration
     except Exception as e:
@@ -103,99 +123,198 @@ def get_video_duration(video_path: str) -> float:
         sys.exit(1)
 
 
-def create_static_frame_background(duration: float) -> 'ffmpeg.Stream':
-    """静止画背景用のカラーストリームを作成する
+def calculate_sequence_duration(sequence: List[Union[VideoSegment, Transition]]) -> float:
+    """シーケンス全体の長さを計算する
     
     Args:
-        duration: 継続時間（秒）
+        sequence: 動画セグメントとトランジションのリスト
         
     Returns:
-        'ffmpeg.Stream': ffmpegのカラーストリーム
+        シーケンス全体の長さ（秒）
     """
-    color_filter = f"color=black:size={DEFAULT_VIDEO_WIDTH}x{DEFAULT_VIDEO_HEIGHT}:duration={duration}:rate={DEFAULT_FPS}"
-    return ffmpeg.input(color_filter, f='lavfi')
+    # 同じ動画が複数回使われていても長さの取得（ffprobeの起動）は1回にする
+    video_durations: dict[str, float] = {}
+    for item in sequence:
+        if isinstance(item, VideoSegment) and item.path not in video_durations:
+            video_durations[item.path] = get_video_duration(item.path)
+    
+    total_duration = 0.0
+    
+    for item in sequence:
+        if isinstance(item, VideoSegment):
+            total_duration += video_durations[item.path]
+        elif isinstance(item, Transition):
+            if item.mode == TransitionMode.CROSSFADE_NO_INCREASE:
+                # 増加無し: 前動画から短縮分を差し引く
+                total_duration -= item.duration
+            elif item.mode == TransitionMode.CROSSFADE_INCREASE:
+                # 増加あり: フェイド時間を追加
+                total_duration += item.duration
+            # NONE の場合は何もしない
+    
+    return total_duration
 
 
-def extract_frame(video_path: str, timestamp: float, duration: float = FRAME_DURATION) -> 'ffmpeg.Stream':
-    """動画からフレームを抽出する
+def _extract_frame_filters(timestamp: float, duration: float) -> List[str]:
+    """デコード済みの映像からフレームを切り出すフィルター記述の列を返す
     
-    Args:
-        video_path: 動画ファイルのパス
-        timestamp: 抽出するフレームのタイムスタンプ（秒）
-        duration: フレームの継続時間（秒）
-        
-    Returns:
-        'ffmpeg.Stream': 抽出されたフレームのストリーム
+    入力を開き直してシークする代わりに、同じ入力のデコード結果から trim で
+    切り出す。縦横比を保ったまま出力サイズに収め、余白は黒で埋める。
     """
-    return ffmpeg.input(video_path, ss=timestamp, t=duration).video.filter('scale', DEFAULT_VIDEO_WIDTH, DEFAULT_VIDEO_HEIGHT)
+    return [f'trim=duration={duration}:start={timestamp}',
+            'setpts=PTS-STARTPTS',
+            f'scale={DEFAULT_VIDEO_WIDTH}:{DEFAULT_VIDEO_HEIGHT}:force_original_aspect_ratio=decrease',
+            f'pad={DEFAULT_VIDEO_WIDTH}:{DEFAULT_VIDEO_HEIGHT}:(ow-iw)/2:(oh-ih)/2']
 
 
-def create_crossfade_segment(video1: str, video2: str, video1_duration: float, fade_duration: float) -> 'ffmpeg.Stream':
-    """クロスフェイドセグメントを作成する
+def _crossfade_filter_chains(video1: str, video2: str, video1_duration: float,
+                             fade_duration: float, label: str) -> List[str]:
+    """クロスフェイドセグメントを作るフィルターチェーンの列を返す
     
     Args:
-        video1: 前の動画ファイルのパス
-        video2: 後の動画ファイルのパス
+        video1: 前の動画の映像ストリームのラベル（例: "0:v"、入力の先頭から始まるもの）
+        video2: 後の動画の映像ストリームのラベル（入力の先頭から始まるもの）
         video1_duration: 前の動画の長さ（秒）
         fade_duration: フェイド時間（秒）
+        label: クロスフェイドセグメントの出力ラベル
         
     Returns:
-        'ffmpeg.Stream': クロスフェイドセグメントのストリーム
+        List[str]: filter_complex 用のフィルターチェーン
     """
-    # 前動画の最後のフレームを静止画として作成
-    last_frame_bg = create_static_frame_background(fade_duration)
-    last_frame = extract_frame(video1, video1_duration - FRAME_DURATION, FRAME_DURATION)
-    last_frame_static = ffmpeg.overlay(last_frame_bg, last_frame)
-    
-    # 後動画の最初のフレームを静止画として作成
-    first_frame_bg = create_static_frame_background(fade_duration)
-    first_frame = extract_frame(video2, 0, FRAME_DURATION)
-    first_frame_static = ffmpeg.overlay(first_frame_bg, first_frame)
-    
-    # フェード効果を適用
-    last_frame_fadeout = last_frame_static.filter('fade', type='out', start_time=0, duration=fade_duration)
-    first_frame_fadein = first_frame_static.filter('fade', type='in', start_time=0, duration=fade_duration)
-    
-    # クロスフェイドセグメントを合成
-    return ffmpeg.overlay(last_frame_fadeout, first_frame_fadein)
-
-
-def calculate_sequence_duration(sequence: List[Union[VideoSegment, Transition]]) -> float:
-    """シーケンス全体の長さを計算する
+    # 前動画の最後のフレームと後動画の最初のフレームを、フェイド時間分の静止映像にする
+    # （fps を先に適用し、tpad は出力フレームレートで複製させる）
+    # コンテナの長さは最終フレームの表示時刻より長いことがあるため、末尾区間を
+    # 逆順にして先頭（＝最後のフレーム）を取り出す
+    static_filters = [f'fps=fps={DEFAULT_FPS}', f'tpad=stop_duration={fade_duration}:stop_mode=clone']
+    last_frame = (_extract_frame_filters(max(0.0, video1_duration - LAST_FRAME_WINDOW), LAST_FRAME_WINDOW)
+                  + ['reverse', 'trim=end_frame=1'] + static_filters)
+    first_frame = _extract_frame_filters(0, FRAME_DURATION) + ['trim=end_frame=1'] + static_filters
+    
+    # 2つの静止映像をxfadeで1パスのクロスフェイドに合成し、フェイド時間に揃える
+    return [
+        f"[{video1}]{','.join(last_frame)}[{label}_last]",
+        f"[{video2}]{','.join(first_frame)}[{label}_first]",
+        f"[{label}_last][{label}_first]xfade=duration={fade_duration}:offset=0:transition=fade,"
+        f"trim=duration={fade_duration}[{label}]",
+    ]
+
+
+def build_concat_filter_complex(sequence: List[Union[VideoSegment, Transition]],
+                                decoder_threads: int | None = None,
+                                input_indexes: dict[str, int] | None = None,
+                                label_prefix: str = '') -> Tuple[List[str], str, str]:
+    """シーケンスを連結する filter_complex を文字列として直接組み立てる（FFmpegは実行しない）
+    
+    連結前の各セグメントや連結後の映像ストリームにはラベルを付けるため、
+    後段にオーバーレイなどのフィルターをつないで1回のFFmpeg実行で処理できる。
+    ffmpeg-pythonのノードは経由しない（ffmpeg-pythonのコンパイルはノード数の
+    2乗に比例して遅くなる）。
     
     Args:
         sequence: 動画セグメントとトランジションのリスト
+        decoder_threads: 各入力動画のデコードに使うスレッド数（省略時はFFmpegの既定値）
+        input_indexes: 追加済みの入力動画のパスと入力番号（複数のシーケンスを1つのコマンドに
+            まとめる場合に共有する。新しく開く動画はここに追加される）
+        label_prefix: フィルターグラフ内のラベルの接頭辞（複数のシーケンスをまとめる場合に区別する）
         
     Returns:
-        シーケンス全体の長さ（秒）
+        Tuple[List[str], str, str]: 新しく追加した入力の引数リスト、filter_complex の文字列、
+            連結後の映像ストリームのラベル
     """
-    total_duration = 0.0
-    previous_video_duration = 0.0
-    
+    input_options = []
+    if DEFAULT_HWACCEL:
+        input_options += ['-hwaccel', DEFAULT_HWACCEL]
+    if decoder_threads:
+        input_options += ['-threads', str(decoder_threads)]
+    
+    # 同じ動画は1回だけ入力として開き、各参照先でデコード結果を共有する
+    input_args: List[str] = []
+    if input_indexes is None:
+        input_indexes = {}
     for item in sequence:
+        if isinstance(item, VideoSegment) and item.path not in input_indexes:
+            input_indexes[item.path] = len(input_indexes)
+            input_args += [*input_options, '-i', item.path]
+    
+    filter_chains: List[str] = []
+    segment_labels: List[str] = []
+    current_video = ''
+    current_video_duration = 0.0
+    
+    print("シーケンス処理中...")
+    
+    for i, item in enumerate(sequence):
         if isinstance(item, VideoSegment):
-            video_duration = get_video_duration(item.path)
-            total_duration += video_duration
-            previous_video_duration = video_duration
+            print(f"- 動画セグメント: {os.path.basename(item.path)}")
+            current_video = f'{input_indexes[item.path]}:v'
+            current_video_duration = get_video_duration(item.path)
+            
+            # 次の要素がno_increaseのクロスフェイドかチェック
+            next_item = sequence[i + 1] if i + 1 < len(sequence) else None
+            if (next_item and isinstance(next_item, Transition) and 
+                next_item.mode == TransitionMode.CROSSFADE_NO_INCREASE):
+                # 前動画を短縮
+                shortened_duration = current_video_duration - next_item.duration
+                label = f'{label_prefix}seg{i}'
+                filter_chains.append(f'[{current_video}]trim=duration={shortened_duration},'
+                                     f'setpts=PTS-STARTPTS[{label}]')
+                segment_labels.append(label)
+                print(f"  短縮: {current_video_duration:.1f}s → {shortened_duration:.1f}s")
+            else:
+                # そのまま
+                segment_labels.append(current_video)
+                print(f"  長さ: {current_video_duration:.1f}s")
+        
         elif isinstance(item, Transition):
-            if item.mode == TransitionMode.CROSSFADE_NO_INCREASE:
-                # 増加無し: 前動画から短縮分を差し引く
-                total_duration -= item.duration
-            elif item.mode == TransitionMode.CROSSFADE_INCREASE:
-                # 増加あり: フェイド時間を追加
-                total_duration += item.duration
-            # NONE の場合は何もしない
+            if item.mode in [TransitionMode.CROSSFADE_NO_INCREASE, TransitionMode.CROSSFADE_INCREASE]:
+                # 次の動画セグメントを取得
+                next_video = sequence[i + 1] if i + 1 < len(sequence) else None
+                if not next_video or not isinstance(next_video, VideoSegment):
+                    print("エラー: トランジションの後に動画セグメントが必要です")
+                    sys.exit(1)
+                
+                print(f"- クロスフェイド: {item.duration:.1f}秒 ({item.mode.value})")
+                label = f'{label_prefix}xf{i}'
+                filter_chains += _crossfade_filter_chains(
+                    current_video, f'{input_indexes[next_video.path]}:v',
+                    current_video_duration, item.duration, label
+                )
+                segment_labels.append(label)
+            # NONE の場合は何もしない（単純連結）
     
-    return total_duration
+    if not segment_labels:
+        print("エラー: 処理可能なセグメントがありません")
+        sys.exit(1)
+    
+    print(f"セグメント数: {len(segment_labels)}")
+    
+    # concatフィルターで連結（1セグメントの場合も出力ラベルを揃える）
+    inputs = ''.join(f'[{label}]' for label in segment_labels)
+    concat_label = f'{label_prefix}concat'
+    if len(segment_labels) == 1:
+        filter_chains.append(f'{inputs}null[{concat_label}]')
+    else:
+        filter_chains.append(f'{inputs}concat=a=0:n={len(segment_labels)}:unsafe=1:v=1[{concat_label}]')
+    return input_args, ';'.join(filter_chains), concat_label
 
 
 def concatenate_videos_advanced(sequence: List[Union[VideoSegment, Transition]], 
-                              output: str) -> None:
+                              output: str,
+                              threads: int | None = None,
+                              encoding_profile: str | None = None,
+                              decoder_threads: int | None = None,
+                              progress_callback: 'ProgressCallback | None' = None,
+                              vcodec: str | None = None) -> None:
     """複数動画を高度な結合モードで連結する
     
     Args:
         sequence: 動画セグメントとトランジションのリスト
         output_path: 出力動画ファイルのパス
+        threads: FFmpeg 1回の実行あたりのスレッド数（省略時は MOVIE_MIX_FFMPEG_THREADS を参照）
+        encoding_profile: エンコードプロファイル名（"fast" で速度優先、libx264のみ有効）
+        decoder_threads: 各入力動画のデコードに使うスレッド数（省略時はFFmpegの既定値）
+        progress_callback: エンコードの進捗の通知先（FFmpegの -progress の値を辞書で受け取る）
+        vcodec: 出力のビデオコーデック（省略時は DEFAULT_VIDEO_CODEC、"libx265" はWPP・フレーム並列を有効にする）
     """
     
     # シーケンス検証
@@ -212,82 +331,33 @@ def concatenate_videos_advanced(sequence: List[Union[VideoSegment, Transition]],
     print(f"シーケンス全体の長さ: {total_duration:.2f}秒")
     
     try:
-        segments_list = []
-        current_video_path = None
-        current_video_duration = 0.0
-        
-        print("シーケンス処理中...")
-        
-        for i, item in enumerate(sequence):
-            if isinstance(item, VideoSegment):
-                print(f"- 動画セグメント: {os.path.basename(item.path)}")
-                current_video_path = item.path
-                current_video_duration = get_video_duration(item.path)
-                
-                # 次の要素がno_increaseのクロスフェイドかチェック
-                next_item = sequence[i + 1] if i + 1 < len(sequence) else None
-                if (next_item and isinstance(next_item, Transition) and 
-                    next_item.mode == TransitionMode.CROSSFADE_NO_INCREASE):
-                    # 前動画を短縮
-                    shortened_duration = current_video_duration - next_item.duration
-                    if DEFAULT_HWACCEL:
-                        video_input = ffmpeg.input(item.path, t=shortened_duration, hwaccel=DEFAULT_HWACCEL)
-                    else:
-                        video_input = ffmpeg.input(item.path, t=shortened_duration)
-                    print(f"  短縮: {current_video_duration:.1f}s → {shortened_duration:.1f}s")
-                else:
-                    # そのまま
-                    if DEFAULT_HWACCEL:
-                        video_input = ffmpeg.input(item.path, hwaccel=DEFAULT_HWACCEL)
-                    else:
-                        video_input = ffmpeg.input(item.path)
-                    print(f"  長さ: {current_video_duration:.1f}s")
-                
-                segments_list.append(video_input.video)
-                
-            elif isinstance(item, Transition):
-                if item.mode in [TransitionMode.CROSSFADE_NO_INCREASE, TransitionMode.CROSSFADE_INCREASE]:
-                    # 次の動画セグメントを取得
-                    next_video = sequence[i + 1] if i + 1 < len(sequence) else None
-                    if not next_video or not isinstance(next_video, VideoSegment):
-                        print("エラー: トランジションの後に動画セグメントが必要です")
-                        sys.exit(1)
-                    
-                    print(f"- クロスフェイド: {item.duration:.1f}秒 ({item.mode.value})")
-                    crossfade_segment = create_crossfade_segment(
-                        current_video_path, next_video.path, 
-                        current_video_duration, item.duration
-                    )
-                    segments_list.append(crossfade_segment)
-                # NONE の場合は何もしない（単純連結）
-        
-        if not segments_list:
-            print("エラー: 処理可能なセグメントがありません")
-            sys.exit(1)
-        
-        print(f"セグメント数: {len(segments_list)}")
-        
-        # concatフィルターで連結
-        if len(segments_list) == 1:
-            concatenated = segments_list[0]
-        else:
-            concatenated = ffmpeg.concat(*segments_list, v=1, a=0, unsafe=1)
+        # フィルターグラフは文字列として直接組み立てる（ffmpeg-pythonのコンパイルを経由しない）
+        input_args, filter_complex, concat_label = build_concat_filter_complex(
+            sequence, decoder_threads=decoder_threads)
         
         # 出力設定
-        out = ffmpeg.output(concatenated, output,
-                          vcodec=DEFAULT_VIDEO_CODEC,
-                          pix_fmt=DEFAULT_PIXEL_FORMAT,
-                          r=DEFAULT_FPS)
+        threads = get_ffmpeg_threads(threads)
+        thread_params = {'threads': threads, 'thread_type': 'slice+frame'} if threads else {}
+        vcodec = vcodec or DEFAULT_VIDEO_CODEC
+        codec_params = get_x265_params(threads) if vcodec == 'libx265' else {}
+        output_options = {'vcodec': vcodec,
+                          'pix_fmt': DEFAULT_PIXEL_FORMAT,
+                          'r': DEFAULT_FPS,
+                          **codec_params,
+                          **get_encoding_params(encoding_profile, vcodec),
+                          **thread_params}
         
         # 既存ファイルがあれば上書き
-        out = ffmpeg.overwrite_output(out)
+        args = ['ffmpeg', '-y', *input_args,
+                '-filter_complex', filter_complex, '-map', f'[{concat_label}]',
+                *_output_option_args(output_options), output]
         
         print("動画連結処理開始...")
         print(f"出力: {output}")
         print(f"合計時間: {total_duration:.1f}秒")
         
-        # 実行
-        ffmpeg.run(out, quiet=False)
+        # 実行（長いシーケンスではフィルターグラフをファイル経由で渡す）
+        run_ffmpeg_args(args, quiet=False, progress_callback=progress_callback)
         print("動画連結完了!")
         
     except ffmpeg.Error as e:
@@ -300,6 +370,141 @@ def concatenate_videos_advanced(sequence: List[Union[VideoSegment, Transition]],
         sys.exit(1)
 
 
+def concatenate_videos_stream_copy(video_paths: List[str], output: str,
+                                   progress_callback: 'ProgressCallback | None' = None) -> None:
+    """同じ形式の動画を再エンコードせずに連結する（concat demuxer + ストリームコピー）
+    
+    コーデック・解像度・フレームレート・ピクセルフォーマットに加え、
+    プロファイル・レベル・コーデック固有データ（H.264のSPS/PPS）・タイムベースが
+    一致している動画のみを対象とする（MP4には先頭の動画のコーデック固有データ
+    だけが残るため）。音声はフィルター処理版と同様に出力しない。
+    
+    Args:
+        video_paths: 連結する動画ファイルのパスのリスト
+        output: 出力動画ファイルのパス
+        progress_callback: 連結の進捗の通知先（FFmpegの -progress の値を辞書で受け取る）
+        
+    Raises:
+        ffmpeg.Error: FFmpegの実行に失敗した場合
+    """
+    # concat demuxer用のリストファイルを作成（パス中の ' はエスケープする）
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', prefix='movie_mix_concat_', delete=False) as f:
+        for path in video_paths:
+            escaped_path = os.path.abspath(path).replace("'", "'\\''")
+            f.write(f"file '{escaped_path}'\n")
+    
+    try:
+        # auto_convert で各ファイルのH.264に h264_mp4toannexb を適用し、ファイルごとの
+        # SPS/PPSをキーフレームの前に埋め込む（ファイルが切り替わっても正しく復号できる）
+        args = ['ffmpeg', '-y', '-f', 'concat', '-safe', '0', '-auto_convert', '1', '-i', f.name,
+                '-map', '0:v', '-c', 'copy', output]
+        
+        print("動画連結処理開始（再エンコードなし）...")
+        print(f"出力: {output}")
+        
+        # 実行
+        run_ffmpeg_args(args, quiet=False, progress_callback=progress_callback)
+        print("動画連結完了!")
+    finally:
+        os.unlink(f.name)
+
+
+def concatenate_videos_hybrid(sequence: List[Union[VideoSegment, Transition]],
+                              output: str,
+                              width: int,
+                              height: int,
+                              fps: float,
+                              pix_fmt: str,
+                              threads: int | None = None,
+                              encoding_profile: str | None = None,
+                              profile: str | None = None,
+                              level: int | None = None,
+                              time_base: str | None = None,
+                              progress_callback: 'ProgressCallback | None' = None) -> None:
+    """クロスフェイド部分だけをエンコードし、残りはストリームコピーで連結する
+
+    各動画はそのまま（再エンコードなしで）使い、クロスフェイド(増加あり)の
+    区間だけを入力と同じ解像度・フレームレート・ピクセルフォーマットで
+    エンコードして、concat demuxer でまとめて連結する。動画を短縮する
+    クロスフェイド(増加無し)はパケット単位で切れないため対象外。
+
+    MP4には先頭の動画のSPS/PPSしか残らないため、クロスフェイド区間は常に
+    libx264で入力と同じプロファイル・レベル・タイムスケールでエンコードし、
+    キーフレームごとにSPS/PPSを埋め込む（連結時は各ファイルのSPS/PPSも
+    キーフレームの前に埋め込まれる）。
+
+    Args:
+        sequence: 動画セグメントとトランジションのリスト（単純結合とクロスフェイド(増加あり)のみ）
+        output: 出力動画ファイルのパス
+        width: 入力動画の幅（ピクセル）
+        height: 入力動画の高さ（ピクセル）
+        fps: 入力動画のフレームレート
+        pix_fmt: 入力動画のピクセルフォーマット
+        threads: FFmpeg 1回の実行あたりのスレッド数（省略時は MOVIE_MIX_FFMPEG_THREADS を参照）
+        encoding_profile: エンコードプロファイル名
+        profile: 入力動画のH.264プロファイル（ffprobeの表記、例: "High"）
+        level: 入力動画のH.264レベル（ffprobeの表記、例: 42）
+        time_base: 入力動画の映像ストリームのタイムベース（例: "1/15360"）
+        progress_callback: 最後の連結（ストリームコピー）の進捗の通知先
+            （短いクロスフェイド区間のエンコードでは呼び出さない）
+
+    Raises:
+        ValueError: クロスフェイド(増加無し)を含む場合、動画セグメントとトランジションが
+            交互に並んでいない場合、libx264で出力できないプロファイルの場合
+        ffmpeg.Error: FFmpegの実行に失敗した場合
+    """
+    if any(isinstance(item, Transition) and item.mode == TransitionMode.CROSSFADE_NO_INCREASE
+           for item in sequence):
+        raise ValueError("クロスフェイド(増加無し)を含むシーケンスはストリームコピーで連結できません")
+    if len(sequence) % 2 == 0 or any(isinstance(item, Transition) != (i % 2 == 1) for i, item in enumerate(sequence)):
+        raise ValueError("シーケンスは動画セグメントで始まり、動画セグメントとトランジションが交互に並ぶ必要があります")
+    if profile is not None and profile not in X264_PROFILES:
+        raise ValueError(f"libx264で出力できないプロファイルです: {profile}")
+
+    threads = get_ffmpeg_threads(threads)
+    thread_params = {'threads': threads} if threads else {}
+
+    with tempfile.TemporaryDirectory(prefix='movie_mix_hybrid_') as temp_dir:
+        parts = []
+        for i, item in enumerate(sequence):
+            if isinstance(item, VideoSegment):
+                parts.append(item.path)
+            elif item.mode == TransitionMode.CROSSFADE_INCREASE:
+                prev_path = sequence[i - 1].path
+                next_path = sequence[i + 1].path
+
+                # 前の動画は末尾付近だけをデコードする（入力側シークで先頭が0秒になる）
+                prev_duration = get_video_duration(prev_path)
+                seek_start = max(0.0, prev_duration - 1.0)
+                filter_chains = _crossfade_filter_chains(
+                    '0:v', '1:v', prev_duration - seek_start, item.duration, 'xf')
+
+                transition_path = os.path.join(temp_dir, f'transition_{i}.mp4')
+                output_options = {'vcodec': 'libx264',
+                                  'pix_fmt': pix_fmt,
+                                  'r': fps,
+                                  's': f'{width}x{height}',
+                                  **get_encoding_params(encoding_profile, 'libx264'),
+                                  **thread_params,
+                                  # キーフレームごとにSPS/PPSを埋め込む
+                                  'x264-params': 'repeat-headers=1'}
+                if profile is not None:
+                    output_options['profile:v'] = X264_PROFILES[profile]
+                if level is not None:
+                    output_options['level'] = f'{level / 10:.1f}'
+                if time_base is not None:
+                    output_options['video_track_timescale'] = time_base.partition('/')[2]
+                args = ['ffmpeg', '-y', '-ss', str(seek_start), '-i', prev_path, '-i', next_path,
+                        '-filter_complex', ';'.join(filter_chains), '-map', '[xf]',
+                        *_output_option_args(output_options), transition_path]
+                print(f"- クロスフェイド区間をエンコード: {item.duration:.1f}秒")
+                run_ffmpeg_args(args, quiet=True)
+                parts.append(transition_path)
+            # NONE の場合は何もしない（単純連結）
+
+        concatenate_videos_stream_copy(parts, output, progress_callback=progress_callback)
+
+
 def parse_crossfade_string(crossfade_str: str) -> List[Transition]:
     """クロスフェイド文字列をパースしてTransitionリストに変換
     
@@ -508,10 +713,13 @@ def _try_hardware_accelerated_crossfade(
         output_duration = custom_duration
     
     # 出力設定（ハードウェアエンコーダー）
+    threads = get_ffmpeg_threads()
+    thread_params = {'threads': threads} if threads else {}
     out = ffmpeg.output(crossfaded, output_path,
                       vcodec=DEFAULT_VIDEO_CODEC,
                       pix_fmt=DEFAULT_PIXEL_FORMAT,
-                      r=DEFAULT_FPS)
+                      r=DEFAULT_FPS,
+                      **thread_params)
     
     # 既存ファイル上書き
     out = ffmpeg.overwrite_output(out)
@@ -612,10 +820,13 @@ def _try_software_fallback_crossfade(
         output_duration = custom_duration
     
     # 出力設定（ソフトウェアエンコーダー）
+    threads = get_ffmpeg_threads()
+    thread_params = {'threads': threads} if threads else {}
     out = ffmpeg.output(crossfaded, output_path,
                       vcodec='libx264',  # ソフトウェアエンコーダー
                       pix_fmt=DEFAULT_PIXEL_FORMAT,
-                      r=DEFAULT_FPS)
+                      r=DEFAULT_FPS,
+                      **thread_params)
     
     # 既存ファイル上書き
     out = ffmpeg.overwrite_output(out)
@@ -751,11 +962,12 @@ def main() -> None:
     # コマンドライン引数をパース
     args = parse_arguments()
     
-    # 動画ファイルの存在チェック
-    for video_path in args.videos:
-        if not os.path.exists(video_path):
+    # 動画ファイルの存在チェック（見つからないものをまとめて表示）
+    missing_paths = _find_missing_files(args.videos)
+    if missing_paths:
+        for video_path in missing_paths:
             print(f"エラー: 動画ファイルが見つかりません: {video_path}")
-            sys.exit(1)
+        sys.exit(1)
     
     if len(args.videos) < 2:
         print("エラー: 少なくとも2つの動画ファイルが必要です")
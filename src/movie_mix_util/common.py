@@ -0,0 +1,468 @@
+"""
+動画処理の共通ヘルパー
+
+FFmpegの実行、ハードウェアアクセラレーションの検出、エンコード設定、
+ffprobe結果のキャッシュなど、各モジュールで共有する処理をまとめる。
+他のパッケージ内モジュールには依存しないため、どのモジュールからも
+先頭でインポートできる。
+"""
+
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+import ffmpeg
+import functools
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Tuple
+import platform
+import os
+
+# 定数定義
+DEFAULT_VIDEO_WIDTH = 1920
+DEFAULT_VIDEO_HEIGHT = 1080
+DEFAULT_FPS = 30
+DEFAULT_PIXEL_FORMAT = 'yuv420p'
+# オーバーレイする静止画の入力フレームレート（合成時は背景の各フレームに直前の画像を使い回す）
+OVERLAY_IMAGE_FRAMERATE = 1
+
+
+# ハードウェアアクセラレーションの検出と設定
+@functools.lru_cache(maxsize=1)
+def _get_available_encoders() -> tuple[str, ...]:
+    """FFmpegで利用可能なH.264エンコーダを取得する（結果はプロセス内でキャッシュ）"""
+    encoders_result = subprocess.run(['ffmpeg', '-encoders'], 
+                                   capture_output=True, text=True, check=False)
+    available_encoders = []
+    if encoders_result.returncode == 0:
+        for line in encoders_result.stdout.split('\n'):
+            if 'h264' in line and ('libx264' in line or 'videotoolbox' in line or 'nvenc' in line or 'qsv' in line or 'vaapi' in line):
+                if 'libx264' in line:
+                    available_encoders.append('libx264')
+                if 'h264_videotoolbox' in line:
+                    available_encoders.append('h264_videotoolbox')
+                if 'h264_nvenc' in line:
+                    available_encoders.append('h264_nvenc')
+                if 'h264_qsv' in line:
+                    available_encoders.append('h264_qsv')
+                if 'h264_vaapi' in line:
+                    available_encoders.append('h264_vaapi')
+    return tuple(available_encoders)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_available_hwaccels() -> tuple[str, ...]:
+    """FFmpegで利用可能なハードウェアアクセラレーションを取得する（結果はプロセス内でキャッシュ）"""
+    hwaccels_result = subprocess.run(['ffmpeg', '-hwaccels'], 
+                                   capture_output=True, text=True, check=False)
+    available_hwaccels = []
+    if hwaccels_result.returncode == 0:
+        for line in hwaccels_result.stdout.split('\n'):
+            line = line.strip()
+            if line and line not in ['Hardware acceleration methods:', '']:
+                available_hwaccels.append(line)
+    return tuple(available_hwaccels)
+
+
+def is_nvenc_available() -> bool:
+    """CUDAデコードとNVENCエンコードの両方が利用可能か判定する
+    
+    Returns:
+        bool: h264_nvenc と cuda hwaccel の両方が利用可能な場合 True
+    """
+    try:
+        return 'h264_nvenc' in _get_available_encoders() and 'cuda' in _get_available_hwaccels()
+    except OSError:
+        return False
+
+
+def _get_hw_codec_and_accel() -> Tuple[str, str | None]:
+    """OSとFFmpegのビルド情報に基づいて最適なハードウェアコーデックとアクセラレータを検出する"""
+    hw_codec = 'libx264'  # デフォルトはソフトウェアエンコーダ
+    hw_accel = None
+
+    # 環境変数でハードウェアアクセラレーションを無効化
+    if os.getenv('MOVIE_MIX_DISABLE_HWACCEL', '0') == '1':
+        print("環境変数 MOVIE_MIX_DISABLE_HWACCEL=1 が設定されているため、ハードウェアアクセラレーションを無効にします。")
+        return hw_codec, hw_accel
+
+    try:
+        # FFmpegの利用可能なエンコーダとハードウェアアクセラレーションを取得
+        available_encoders = list(_get_available_encoders())
+        available_hwaccels = list(_get_available_hwaccels())
+        
+        sys.stderr.write(f"DEBUG: Available encoders: {available_encoders}\n")
+        sys.stderr.write(f"DEBUG: Available hwaccels: {available_hwaccels}\n")
+
+        system = platform.system()
+
+        if system == 'Darwin':  # macOS
+            if 'h264_videotoolbox' in available_encoders:
+                hw_codec = 'h264_videotoolbox'
+                hw_accel = 'videotoolbox'
+                print(f"macOS: VideoToolboxハードウェアアクセラレーションを有効化します ({hw_codec})")
+            else:
+                print("macOS: h264_videotoolboxが見つかりません。ソフトウェアエンコーダを使用します。")
+        elif system == 'Windows':
+            # NVIDIA NVENC
+            if 'h264_nvenc' in available_encoders:
+                hw_codec = 'h264_nvenc'
+                hw_accel = 'cuda' # または 'd3d11va', 'dxva2'
+                print(f"Windows: NVIDIA NVENCハードウェアアクセラレーションを有効化します ({hw_codec})")
+            # Intel Quick Sync Video (QSV)
+            elif 'h264_qsv' in available_encoders:
+                hw_codec = 'h264_qsv'
+                hw_accel = 'qsv'
+                print(f"Windows: Intel QSVハードウェアアクセラレーションを有効化します ({hw_codec})")
+            else:
+                print("Windows: NVIDIA NVENCまたはIntel QSVが見つかりません。ソフトウェアエンコーダを使用します。")
+        elif system == 'Linux':
+            # NVIDIA NVENC
+            if 'h264_nvenc' in available_encoders:
+                hw_codec = 'h264_nvenc'
+                hw_accel = 'cuda'
+                print(f"Linux: NVIDIA NVENCハードウェアアクセラレーションを有効化します ({hw_codec})")
+            # Intel Quick Sync Video (QSV)
+            elif 'h264_qsv' in available_encoders:
+                hw_codec = 'h264_qsv'
+                hw_accel = 'qsv'
+                print(f"Linux: Intel QSVハードウェアアクセラレーションを有効化します ({hw_codec})")
+            # VAAPI (Intel, AMD, etc.)
+            elif 'h264_vaapi' in available_encoders and 'vaapi' in available_hwaccels:
+                hw_codec = 'h264_vaapi'
+                hw_accel = 'vaapi'
+                print(f"Linux: VAAPIハードウェアアクセラレーションを有効化します ({hw_codec})")
+            else:
+                print("Linux: ハードウェアエンコーダが見つかりません。ソフトウェアエンコーダを使用します。")
+        else:
+            print(f"不明なOS ({system}): ソフトウェアエンコーダを使用します。")
+
+    except Exception as e:
+        print(f"FFmpegビルド情報の取得中にエラーが発生しました: {e}。ソフトウェアエンコーダを使用します。")
+
+    return hw_codec, hw_accel
+
+
+def should_use_hardware_acceleration(operation_type: str) -> bool:
+    """
+    処理タイプに応じてハードウェアアクセラレーションの使用可否を判定する
+    
+    Args:
+        operation_type (str): 処理タイプ ('mix', 'concat', 'crossfade')
+        
+    Returns:
+        bool: ハードウェアアクセラレーションを使用するかどうか
+    """
+    # 結合処理(concat/crossfade)は常にソフトウェア処理を使用
+    # 結合処理でのHWAは品質劣化の原因となるため
+    if operation_type in ['concat', 'crossfade']:
+        return False
+    
+    # 環境変数で全体的に無効化されている場合
+    if os.getenv('MOVIE_MIX_DISABLE_HWACCEL', '0') == '1':
+        return False
+    
+    # ソフトウェアエンコーダーが選択されている場合
+    if DEFAULT_VIDEO_CODEC == 'libx264':
+        return False
+    
+    # mix処理のみHWA設定を考慮
+    if operation_type == 'mix':
+        mix_setting = os.getenv('MOVIE_MIX_HWA_MIX', 'auto')
+        
+        if mix_setting == 'enabled':
+            return True
+        elif mix_setting == 'disabled':
+            return False
+        elif mix_setting == 'auto':
+            # 自動判定: mix処理でのみHWAを使用
+            return True
+    
+    return False
+
+
+def get_ffmpeg_threads(threads: int | None = None) -> int | None:
+    """FFmpeg 1回の実行あたりのスレッド数を決定する
+    
+    明示的な指定がなければ環境変数 MOVIE_MIX_FFMPEG_THREADS を参照する。
+    どちらも無い場合は None（FFmpegの既定値）を返す。
+    
+    Args:
+        threads (int | None): 明示的に指定されたスレッド数
+        
+    Returns:
+        int | None: 使用するスレッド数
+    """
+    if threads:
+        return threads
+    
+    env_threads = os.getenv('MOVIE_MIX_FFMPEG_THREADS', '')
+    if env_threads.isdigit() and int(env_threads) > 0:
+        return int(env_threads)
+    
+    return None
+
+
+# これを超える長さのフィルターグラフはコマンドラインではなくファイルで渡す（ARG_MAX対策）
+MAX_FILTER_COMPLEX_ARG_LENGTH = 100_000
+
+
+def spill_filter_complex_script(args: list[str]) -> tuple[list[str], str | None]:
+    """長すぎる -filter_complex をスクリプトファイルに書き出した引数に置き換える
+    
+    Args:
+        args (list[str]): ffmpegコマンドの引数リスト
+        
+    Returns:
+        tuple[list[str], str | None]: 置き換え後の引数リストと、書き出したファイルのパス
+            （置き換え不要の場合は元の引数リストと None）
+    """
+    if '-filter_complex' not in args:
+        return args, None
+    
+    index = args.index('-filter_complex')
+    filter_graph = args[index + 1]
+    if len(filter_graph) <= MAX_FILTER_COMPLEX_ARG_LENGTH:
+        return args, None
+    
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', prefix='movie_mix_fg_', delete=False) as f:
+        f.write(filter_graph)
+    return args[:index] + ['-filter_complex_script', f.name] + args[index + 2:], f.name
+
+
+# FFmpegの進捗通知を受け取るコールバック（-progress の key=value を1回分まとめた辞書を渡す）
+ProgressCallback = Callable[[dict[str, str]], None]
+
+
+def _run_with_progress(args: list[str], quiet: bool, progress_callback: ProgressCallback) -> None:
+    """-progress pipe:2 を付けてFFmpegを実行し、進捗を解析してコールバックに渡す
+    
+    統計行の代わりに標準エラーをパイプで受け取るため、端末への出力で
+    エンコードが待たされない。進捗以外のログは quiet でなければそのまま表示し、
+    異常終了時は ffmpeg.Error の stderr に含める。
+    
+    Args:
+        args (list[str]): ffmpegコマンドの引数リスト（先頭は実行ファイル名）
+        quiet (bool): FFmpegのログ出力を抑制するかどうか
+        progress_callback (ProgressCallback): 進捗の通知先
+        
+    Raises:
+        ffmpeg.Error: FFmpegが異常終了した場合
+    """
+    process = subprocess.Popen([args[0], '-progress', 'pipe:2', '-nostats', *args[1:]],
+                               stderr=subprocess.PIPE)
+    log_lines = []
+    progress: dict[str, str] = {}
+    returncode = None
+    try:
+        for raw_line in process.stderr:
+            key, separator, value = raw_line.decode(errors='replace').strip().partition('=')
+            if separator and key and ' ' not in key:
+                # 進捗は "progress=continue|end" の行で1回分が区切られる
+                progress[key] = value
+                if key == 'progress':
+                    progress_callback(progress)
+                    progress = {}
+                continue
+            
+            log_lines.append(raw_line)
+            if not quiet:
+                sys.stderr.buffer.write(raw_line)
+        
+        returncode = process.wait()
+    finally:
+        if returncode is None:
+            # コールバックの例外や中断（Ctrl-C）で抜けた場合はFFmpegを実行したまま残さない
+            process.kill()
+            process.wait()
+    
+    if returncode != 0:
+        raise ffmpeg.Error('ffmpeg', None, b''.join(log_lines))
+
+
+def run_ffmpeg_args(args: list[str], quiet: bool = False,
+                    progress_callback: ProgressCallback | None = None) -> None:
+    """組み立て済みのFFmpegコマンド引数を実行する（長いフィルターグラフはスクリプトファイル経由で渡す）
+    
+    Args:
+        args (list[str]): ffmpegコマンドの引数リスト（先頭は実行ファイル名）
+        quiet (bool): FFmpegの出力を抑制するかどうか
+        progress_callback (ProgressCallback | None): 進捗の通知先（指定時は -progress で進捗を受け取る）
+        
+    Raises:
+        ffmpeg.Error: FFmpegが異常終了した場合
+    """
+    args, script_path = spill_filter_complex_script(args)
+    try:
+        if progress_callback is not None:
+            _run_with_progress(args, quiet, progress_callback)
+            return
+        
+        result = subprocess.run(args, capture_output=quiet, check=False)
+        if result.returncode != 0:
+            raise ffmpeg.Error('ffmpeg', result.stdout, result.stderr)
+    finally:
+        if script_path is not None:
+            os.unlink(script_path)
+
+
+def run_ffmpeg(stream_spec: Any, quiet: bool = False,
+               progress_callback: ProgressCallback | None = None) -> None:
+    """FFmpegを実行する（長いフィルターグラフはスクリプトファイル経由で渡す）
+    
+    Args:
+        stream_spec (Any): ffmpeg-pythonの出力ストリーム
+        quiet (bool): FFmpegの出力を抑制するかどうか
+        progress_callback (ProgressCallback | None): 進捗の通知先（指定時は -progress で進捗を受け取る）
+        
+    Raises:
+        ffmpeg.Error: FFmpegが異常終了した場合
+    """
+    args = ffmpeg.compile(stream_spec)
+    if progress_callback is not None:
+        run_ffmpeg_args(args, quiet=quiet, progress_callback=progress_callback)
+        return
+    
+    if '-filter_complex' in args:
+        filter_graph = args[args.index('-filter_complex') + 1]
+        if len(filter_graph) > MAX_FILTER_COMPLEX_ARG_LENGTH:
+            run_ffmpeg_args(args, quiet=quiet)
+            return
+    
+    ffmpeg.run(stream_spec, quiet=quiet)
+
+
+def _output_option_args(options: dict[str, Any]) -> list[str]:
+    """出力オプションの辞書を ffmpeg-python と同じ形式のコマンド引数に変換する"""
+    args: list[str] = []
+    for key, value in sorted(options.items()):
+        args += [f'-{key}', str(value)]
+    return args
+
+
+# 品質より処理速度を優先するエンコードプロファイル（エンコーダごとのオプション）
+ENCODING_PROFILES: dict[str, dict[str, dict[str, str]]] = {
+    'fast': {
+        'libx264': {'preset': 'ultrafast', 'tune': 'zerolatency'},
+        'h264_nvenc': {'preset': 'p1', 'tune': 'll'},
+    },
+    # 中間ファイルやバッチ処理向け（fast よりビットレート効率を残す）
+    'throughput': {
+        'libx264': {'preset': 'veryfast', 'tune': 'fastdecode', 'x264-params': 'aq-mode=0'},
+    },
+}
+
+
+def get_encoding_params(encoding_profile: str | None, vcodec: str) -> dict[str, str]:
+    """エンコードプロファイルに対応するFFmpeg出力オプションを取得する
+    
+    preset/tune の値はエンコーダごとに異なるため、プロファイルに定義の無い
+    エンコーダーでは何も追加しない。
+    
+    Args:
+        encoding_profile (str | None): プロファイル名（None の場合は指定なし）
+        vcodec (str): 使用するビデオコーデック
+        
+    Returns:
+        dict[str, str]: ffmpeg.output に渡す追加オプション
+        
+    Raises:
+        ValueError: 未知のプロファイル名が指定された場合
+    """
+    if encoding_profile is None:
+        return {}
+    
+    if encoding_profile not in ENCODING_PROFILES:
+        raise ValueError(f"未知のエンコードプロファイルです: {encoding_profile}")
+    
+    return dict(ENCODING_PROFILES[encoding_profile].get(vcodec, {}))
+
+
+# x265 が受け付けるフレーム並列数の上限
+X265_MAX_FRAME_THREADS = 16
+
+
+def get_x265_params(threads: int | None = None) -> dict[str, str]:
+    """libx265 を複数コアで並列に動かすためのFFmpeg出力オプションを取得する
+    
+    x265 は FFmpeg の -threads ではなく自身のスレッドプールでエンコードするため、
+    WPP（CTU行単位の並列処理）とフレーム並列を明示し、プールの大きさを
+    使用するスレッド数に合わせる。
+    
+    Args:
+        threads (int | None): 使用するスレッド数（None の場合はCPUコア数）
+        
+    Returns:
+        dict[str, str]: ffmpeg.output に渡す追加オプション
+    """
+    threads = threads or os.cpu_count() or 1
+    frame_threads = min(threads, X265_MAX_FRAME_THREADS)
+    return {'preset': 'faster', 'x265-params': f'wpp=1:frame-threads={frame_threads}:pools={threads}'}
+
+
+DEFAULT_VIDEO_CODEC, DEFAULT_HWACCEL = _get_hw_codec_and_accel()
+print(f"DEBUG: Initialized with DEFAULT_VIDEO_CODEC: {DEFAULT_VIDEO_CODEC}, DEFAULT_HWACCEL: {DEFAULT_HWACCEL}")
+
+
+@functools.lru_cache(maxsize=256)
+def _probe_file(path: str, mtime_ns: int, size: int) -> dict[str, Any]:
+    """ffprobeの結果をファイルの更新時刻とサイズをキーにキャッシュする"""
+    return ffmpeg.probe(path)
+
+
+def probe_video(path: str) -> dict[str, Any]:
+    """動画ファイルのffprobe結果を取得する
+    
+    同じファイルへの繰り返しの問い合わせではffprobeを起動せず、キャッシュ
+    した結果を返す。ファイルが更新された場合は再取得する。戻り値は
+    キャッシュと共有されるため、呼び出し側で変更しないこと。
+    
+    Args:
+        path: 動画ファイルのパス
+        
+    Returns:
+        dict[str, Any]: ffmpeg.probe の結果
+        
+    Raises:
+        ffmpeg.Error: ffprobeの実行に失敗した場合
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        # 存在しないファイルなどはキャッシュせず、ffprobeのエラーをそのまま返す
+        return ffmpeg.probe(path)
+    return _probe_file(path, st.st_mtime_ns, st.st_size)
+
+
+def _list_directory(directory: str) -> set[str]:
+    """ディレクトリ内のエントリ名を取得する（取得できない場合は空集合）"""
+    try:
+        with os.scandir(directory) as it:
+            return {entry.name for entry in it}
+    except OSError:
+        return set()
+
+
+def _find_missing_files(paths: list[str]) -> list[str]:
+    """存在しないファイルのパスを返す
+    
+    ファイルごとにstatする代わりに、親ディレクトリごとに1回だけ os.scandir で
+    一覧を取得して照合する。一覧に無いものだけ Path.exists で確認する。
+    ディレクトリの一覧取得と個別の確認はスレッドプールで並行に行うため、
+    ネットワークファイルシステム上でも待ち時間が積み重ならない。
+    
+    Args:
+        paths: 確認するファイルパスのリスト
+        
+    Returns:
+        list[str]: 見つからなかったファイルパスのリスト（入力順）
+    """
+    directories = list({os.path.dirname(path) or '.' for path in paths})
+    with ThreadPoolExecutor(max_workers=min(8, len(directories) or 1)) as executor:
+        entries_by_dir = dict(zip(directories, executor.map(_list_directory, directories)))
+        
+        unlisted = [path for path in paths
+                    if os.path.basename(path) not in entries_by_dir[os.path.dirname(path) or '.']]
+        exists = executor.map(lambda path: Path(path).exists(), unlisted)
+        return [path for path, found in zip(unlisted, exists) if not found]
@@ -14,7 +14,7 @@ import sys
 from typing import List, Tuple, Literal, Union, Any
 
 # 既存の定義をインポート
-from .video_processing_lib import DEFAULT_VIDEO_CODEC, DEFAULT_PIXEL_FORMAT, DEFAULT_HWACCEL, should_use_hardware_acceleration
+from .common import DEFAULT_VIDEO_CODEC, DEFAULT_PIXEL_FORMAT, DEFAULT_HWACCEL, should_use_hardware_acceleration, get_ffmpeg_threads, probe_video
 from .advanced_video_concatenator import (
     CrossfadeEffect,
     DEFAULT_VIDEO_WIDTH,
@@ -99,19 +99,18 @@ class DeferredVideoSequence:
 
         # 最初のストリーム
         current_video_path = video_ops[0][1]
+        # 映像と音声は同じ入力から取り出す（デマックス・デコードは1回）
         if use_hwaccel_for_crossfade and DEFAULT_HWACCEL:
-            processed_video = ffmpeg.input(current_video_path, hwaccel=DEFAULT_HWACCEL).video
+            current_input = ffmpeg.input(current_video_path, hwaccel=DEFAULT_HWACCEL)
         else:
-            processed_video = ffmpeg.input(current_video_path).video
+            current_input = ffmpeg.input(current_video_path)
+        processed_video = current_input.video
         
         # オーディオストリームの有無をチェック
         try:
-            probe = ffmpeg.probe(current_video_path)
+            probe = probe_video(current_video_path)
             if any(s['codec_type'] == 'audio' for s in probe['streams']):
-                if use_hwaccel_for_crossfade and DEFAULT_HWACCEL:
-                    processed_audio = ffmpeg.input(current_video_path, hwaccel=DEFAULT_HWACCEL).audio
-                else:
-                    processed_audio = ffmpeg.input(current_video_path).audio
+                processed_audio = current_input.audio
             else:
                 processed_audio = None
         except ffmpeg.Error:
@@ -148,7 +147,7 @@ class DeferredVideoSequence:
             # 音声のacrossfade
             if processed_audio:
                 try:
-                    next_video_probe = ffmpeg.probe(next_video_path)
+                    next_video_probe = probe_video(next_video_path)
                     if any(s['codec_type'] == 'audio' for s in next_video_probe['streams']):
                         processed_audio = ffmpeg.filter(
                             [processed_audio, next_video_stream.audio],
@@ -175,7 +174,7 @@ class DeferredVideoSequence:
             for video_op in video_ops:
                 video_path = video_op[1]
                 try:
-                    probe_result = ffmpeg.probe(video_path)
+                    probe_result = probe_video(video_path)
                     for stream in probe_result['streams']:
                         if stream['codec_type'] == 'video' and 'bit_rate' in stream:
                             bitrate = int(stream['bit_rate'])
@@ -205,6 +204,11 @@ class DeferredVideoSequence:
                 'b:v': max_bitrate  # 元動画の最高ビットレートを維持
             }
             
+            # スレッド数指定（MOVIE_MIX_FFMPEG_THREADS）
+            threads = get_ffmpeg_threads()
+            if threads:
+                output_params['threads'] = threads
+            
             # ハードウェアエンコーダー用の追加パラメータ
             if DEFAULT_VIDEO_CODEC == 'h264_videotoolbox':
                 # VideoToolbox用の元動画品質維持設定
@@ -251,14 +255,15 @@ class DeferredVideoSequence:
                 
                 # ソフトウェア版のストリーム再構築
                 current_video_path = video_ops[0][1]
-                sw_processed_video = ffmpeg.input(current_video_path).video
+                sw_current_input = ffmpeg.input(current_video_path)
+                sw_processed_video = sw_current_input.video
                 
-                # オーディオストリームの再構築
+                # オーディオストリームの再構築（映像と同じ入力を使う）
                 sw_processed_audio = None
                 try:
-                    probe = ffmpeg.probe(current_video_path)
+                    probe = probe_video(current_video_path)
                     if any(s['codec_type'] == 'audio' for s in probe['streams']):
-                        sw_processed_audio = ffmpeg.input(current_video_path).audio
+                        sw_processed_audio = sw_current_input.audio
                 except ffmpeg.Error:
                     pass
                 
@@ -292,7 +297,7 @@ class DeferredVideoSequence:
                     # 音声のacrossfade
                     if sw_processed_audio:
                         try:
-                            next_video_probe = ffmpeg.probe(next_video_path)
+                            next_video_probe = probe_video(next_video_path)
                             if any(s['codec_type'] == 'audio' for s in next_video_probe['streams']):
                                 sw_processed_audio = ffmpeg.filter(
                                     [sw_processed_audio, next_video_stream.audio],
@@ -322,6 +327,8 @@ class DeferredVideoSequence:
                     'preset': 'slow',  # 品質重視
                     'profile:v': 'high'
                 }
+                if threads:
+                    fallback_params['threads'] = threads
                 
                 sw_cmd = (
                     ffmpeg
@@ -6,171 +6,247 @@
 """
 
 from __future__ import annotations
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from enum import Enum
+import copy
 import ffmpeg
-import sys
-from pathlib import Path
-from typing import Any, Tuple
-import platform
+import functools
+import struct
+import subprocess
+import tempfile
+from typing import Any, Iterable, Literal
 import os
 
-# 定数定義
-DEFAULT_VIDEO_WIDTH = 1920
-DEFAULT_VIDEO_HEIGHT = 1080
-DEFAULT_FPS = 30
-DEFAULT_PIXEL_FORMAT = 'yuv420p'
-
-# ハードウェアアクセラレーションの検出と設定
-def _get_hw_codec_and_accel() -> Tuple[str, str | None]:
-    """OSとFFmpegのビルド情報に基づいて最適なハードウェアコーデックとアクセラレータを検出する"""
-    hw_codec = 'libx264'  # デフォルトはソフトウェアエンコーダ
-    hw_accel = None
-
-    # 環境変数でハードウェアアクセラレーションを無効化
-    if os.getenv('MOVIE_MIX_DISABLE_HWACCEL', '0') == '1':
-        print("環境変数 MOVIE_MIX_DISABLE_HWACCEL=1 が設定されているため、ハードウェアアクセラレーションを無効にします。")
-        return hw_codec, hw_accel
-
-    try:
-        import subprocess
-        
-        # FFmpegの利用可能なエンコーダを取得
-        encoders_result = subprocess.run(['ffmpeg', '-encoders'], 
-                                       capture_output=True, text=True, check=False)
-        available_encoders = []
-        if encoders_result.returncode == 0:
-            for line in encoders_result.stdout.split('\n'):
-                if 'h264' in line and ('libx264' in line or 'videotoolbox' in line or 'nvenc' in line or 'qsv' in line or 'vaapi' in line):
-                    if 'libx264' in line:
-                        available_encoders.append('libx264')
-                    if 'h264_videotoolbox' in line:
-                        available_encoders.append('h264_videotoolbox')
-                    if 'h264_nvenc' in line:
-                        available_encoders.append('h264_nvenc')
-                    if 'h264_qsv' in line:
-                        available_encoders.append('h264_qsv')
-                    if 'h264_vaapi' in line:
-                        available_encoders.append('h264_vaapi')
-        
-        # FFmpegの利用可能なハードウェアアクセラレーションを取得
-        hwaccels_result = subprocess.run(['ffmpeg', '-hwaccels'], 
-                                       capture_output=True, text=True, check=False)
-        available_hwaccels = []
-        if hwaccels_result.returncode == 0:
-            for line in hwaccels_result.stdout.split('\n'):
-                line = line.strip()
-                if line and line not in ['Hardware acceleration methods:', '']:
-                    available_hwaccels.append(line)
-        
-        sys.stderr.write(f"DEBUG: Available encoders: {available_encoders}\n")
-        sys.stderr.write(f"DEBUG: Available hwaccels: {available_hwaccels}\n")
-
-        system = platform.system()
-
-        if system == 'Darwin':  # macOS
-            if 'h264_videotoolbox' in available_encoders:
-                hw_codec = 'h264_videotoolbox'
-                hw_accel = 'videotoolbox'
-                print(f"macOS: VideoToolboxハードウェアアクセラレーションを有効化します ({hw_codec})")
-            else:
-                print("macOS: h264_videotoolboxが見つかりません。ソフトウェアエンコーダを使用します。")
-        elif system == 'Windows':
-            # NVIDIA NVENC
-            if 'h264_nvenc' in available_encoders:
-                hw_codec = 'h264_nvenc'
-                hw_accel = 'cuda' # または 'd3d11va', 'dxva2'
-                print(f"Windows: NVIDIA NVENCハードウェアアクセラレーションを有効化します ({hw_codec})")
-            # Intel Quick Sync Video (QSV)
-            elif 'h264_qsv' in available_encoders:
-                hw_codec = 'h264_qsv'
-                hw_accel = 'qsv'
-                print(f"Windows: Intel QSVハードウェアアクセラレーションを有効化します ({hw_codec})")
-            else:
-                print("Windows: NVIDIA NVENCまたはIntel QSVが見つかりません。ソフトウェアエンコーダを使用します。")
-        elif system == 'Linux':
-            # NVIDIA NVENC
-            if 'h264_nvenc' in available_encoders:
-                hw_codec = 'h264_nvenc'
-                hw_accel = 'cuda'
-                print(f"Linux: NVIDIA NVENCハードウェアアクセラレーションを有効化します ({hw_codec})")
-            # Intel Quick Sync Video (QSV)
-            elif 'h264_qsv' in available_encoders:
-                hw_codec = 'h264_qsv'
-                hw_accel = 'qsv'
-                print(f"Linux: Intel QSVハードウェアアクセラレーションを有効化します ({hw_codec})")
-            # VAAPI (Intel, AMD, etc.)
-            elif 'h264_vaapi' in available_encoders and 'vaapi' in available_hwaccels:
-                hw_codec = 'h264_vaapi'
-                hw_accel = 'vaapi'
-                print(f"Linux: VAAPIハードウェアアクセラレーションを有効化します ({hw_codec})")
-            else:
-                print("Linux: ハードウェアエンコーダが見つかりません。ソフトウェアエンコーダを使用します。")
-        else:
-            print(f"不明なOS ({system}): ソフトウェアエンコーダを使用します。")
+from .common import (
+    DEFAULT_VIDEO_WIDTH,
+    DEFAULT_VIDEO_HEIGHT,
+    DEFAULT_FPS,
+    DEFAULT_PIXEL_FORMAT,
+    DEFAULT_VIDEO_CODEC,
+    DEFAULT_HWACCEL,
+    OVERLAY_IMAGE_FRAMERATE,
+    is_nvenc_available,
+    get_ffmpeg_threads,
+    get_encoding_params,
+    get_x265_params,
+    ProgressCallback,
+    run_ffmpeg,
+    run_ffmpeg_args,
+    _output_option_args,
+    _probe_file,
+    _find_missing_files
+)
+
+# 既存の実装をインポート
+
+# 既存の実装をインポート
+from .advanced_video_concatenator import (
+    TransitionMode,
+    VideoSegment, 
+    Transition,
+    concatenate_videos_advanced,
+    concatenate_videos_stream_copy,
+    concatenate_videos_hybrid,
+    build_concat_filter_complex,
+    get_video_duration,
+    calculate_sequence_duration,
+    X264_PROFILES,
+    CrossfadeEffect,
+    CrossfadeOutputMode,
+    create_crossfade_video
+)
+# from video_mixer import mix_video_with_image  # TODO: 実装が必要
 
-    except Exception as e:
-        print(f"FFmpegビルド情報の取得中にエラーが発生しました: {e}。ソフトウェアエンコーダを使用します。")
 
-    return hw_codec, hw_accel
+# PNGファイルのシグネチャ
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
 
+# JPEGで画像サイズを持つSOFマーカー（C4: DHT, C8: JPG, CC: DAC は除く）
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
 
-def should_use_hardware_acceleration(operation_type: str) -> bool:
-    """
-    処理タイプに応じてハードウェアアクセラレーションの使用可否を判定する
+
+def _read_jpeg_dimensions(f: Any) -> tuple[int, int] | None:
+    """JPEGのマーカーを順にたどり、SOFセグメントから幅と高さを読み取る"""
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        if marker[1] in (0xD8, 0x01) or 0xD0 <= marker[1] <= 0xD7:
+            # 長さを持たないマーカー
+            continue
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack('>H', length_bytes)[0]
+        if marker[1] in _JPEG_SOF_MARKERS:
+            segment = f.read(5)
+            if len(segment) < 5:
+                return None
+            height, width = struct.unpack('>HH', segment[1:5])
+            return width, height
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+@functools.lru_cache(maxsize=256)
+def _read_image_dimensions(image_path: str, mtime_ns: int, size: int) -> tuple[int, int]:
+    """画像サイズをファイルの更新時刻とサイズをキーにキャッシュする"""
+    with open(image_path, 'rb') as f:
+        header = f.read(24)
+        
+        if header[:8] == _PNG_SIGNATURE and header[12:16] == b'IHDR':
+            width, height = struct.unpack('>II', header[16:24])
+            return width, height
+        
+        if header[:2] == b'\xff\xd8':
+            f.seek(2)
+            dimensions = _read_jpeg_dimensions(f)
+            if dimensions is not None:
+                return dimensions
+    
+    from PIL import Image
+    with Image.open(image_path) as img:
+        return img.size
+
+
+def get_image_dimensions(image_path: str) -> tuple[int, int]:
+    """画像の幅と高さを取得する
+    
+    PNGはIHDRチャンク、JPEGはSOFセグメントをヘッダーから直接読み取り、
+    画像データは読み込まない。それ以外の形式はPILでヘッダーのみを読み取る。
+    同じファイルへの繰り返しの問い合わせにはキャッシュした値を返す
+    （ファイルが更新された場合は読み直す）。
     
     Args:
-        operation_type (str): 処理タイプ ('mix', 'concat', 'crossfade')
+        image_path: 画像ファイルのパス
         
     Returns:
-        bool: ハードウェアアクセラレーションを使用するかどうか
+        tuple[int, int]: (幅, 高さ)
+    
+    Raises:
+        FileNotFoundError: 画像ファイルが存在しない場合
+    
+    Examples:
+        >>> width, height = get_image_dimensions("overlay.png")
     """
-    # 結合処理(concat/crossfade)は常にソフトウェア処理を使用
-    # 結合処理でのHWAは品質劣化の原因となるため
-    if operation_type in ['concat', 'crossfade']:
-        return False
+    st = os.stat(image_path)
+    return _read_image_dimensions(image_path, st.st_mtime_ns, st.st_size)
+
+
+def is_opaque_image(image_path: str) -> bool:
+    """画像に透過部分が無いことがヘッダーから確定できるかを判定する
     
-    # 環境変数で全体的に無効化されている場合
-    if os.getenv('MOVIE_MIX_DISABLE_HWACCEL', '0') == '1':
-        return False
+    PNGはIHDRのカラータイプとIDATより前のチャンク（tRNS）だけを調べ、
+    画像データは読み込まない。アルファチャンネルを持つ画像は、実際には
+    すべて不透明でも False を返す。
     
-    # ソフトウェアエンコーダーが選択されている場合
-    if DEFAULT_VIDEO_CODEC == 'libx264':
-        return False
+    Args:
+        image_path: 画像ファイルのパス
     
-    # mix処理のみHWA設定を考慮
-    if operation_type == 'mix':
-        mix_setting = os.getenv('MOVIE_MIX_HWA_MIX', 'auto')
+    Returns:
+        bool: 透過部分が無い場合 True
+    
+    Raises:
+        FileNotFoundError: 画像ファイルが存在しない場合
+    """
+    with open(image_path, 'rb') as f:
+        header = f.read(33)
+        if header[:8] == _PNG_SIGNATURE and header[12:16] == b'IHDR':
+            # カラータイプ 4（グレー+アルファ）と 6（RGBA）はアルファを持つ
+            if header[25] in (4, 6):
+                return False
+            
+            # tRNSチャンク（透過色の指定）は必ずIDATより前に現れる
+            while True:
+                chunk_header = f.read(8)
+                if len(chunk_header) < 8:
+                    return True
+                length, chunk_type = struct.unpack('>I4s', chunk_header)
+                if chunk_type == b'tRNS':
+                    return False
+                if chunk_type in (b'IDAT', b'IEND'):
+                    return True
+                f.seek(length + 4, os.SEEK_CUR)  # チャンクデータとCRCを読み飛ばす
+    
+    from PIL import Image
+    with Image.open(image_path) as img:
+        return img.mode not in ('RGBA', 'LA', 'PA', 'RGBa', 'La') and 'transparency' not in img.info
+
+
+def scale_to_fit_batch(dims: Iterable[tuple[int, int]],
+                       target_width: int = DEFAULT_VIDEO_WIDTH,
+                       target_height: int = DEFAULT_VIDEO_HEIGHT) -> list[tuple[int, int]]:
+    """複数の画像サイズを、アスペクト比を保ったまま画面内に収まるサイズへまとめて変換する
+    
+    Args:
+        dims: (幅, 高さ) の並び
+        target_width: 画面の幅（ピクセル）
+        target_height: 画面の高さ（ピクセル）
         
-        if mix_setting == 'enabled':
-            return True
-        elif mix_setting == 'disabled':
-            return False
-        elif mix_setting == 'auto':
-            # 自動判定: mix処理でのみHWAを使用
-            return True
+    Returns:
+        list[tuple[int, int]]: スケーリング後の (幅, 高さ) のリスト
     
-    return False
+    Examples:
+        >>> scale_to_fit_batch([(2000, 1000), (1000, 2000)])
+        [(1920, 960), (540, 1080)]
+    """
+    target_aspect = target_width / target_height
+    return [
+        (target_width, int(target_width / (w / h))) if w / h > target_aspect
+        else (int(target_height * (w / h)), target_height)
+        for w, h in dims
+    ]
 
-DEFAULT_VIDEO_CODEC, DEFAULT_HWACCEL = _get_hw_codec_and_accel()
-print(f"DEBUG: Initialized with DEFAULT_VIDEO_CODEC: {DEFAULT_VIDEO_CODEC}, DEFAULT_HWACCEL: {DEFAULT_HWACCEL}")
 
+def center_offsets_batch(sizes: Iterable[tuple[int, int]],
+                         target_width: int = DEFAULT_VIDEO_WIDTH,
+                         target_height: int = DEFAULT_VIDEO_HEIGHT) -> list[tuple[int, int]]:
+    """複数のサイズについて、画面中央に配置するためのオフセットをまとめて計算する
+    
+    Args:
+        sizes: 配置する (幅, 高さ) の並び
+        target_width: 画面の幅（ピクセル）
+        target_height: 画面の高さ（ピクセル）
+        
+    Returns:
+        list[tuple[int, int]]: (xオフセット, yオフセット) のリスト
+    
+    Examples:
+        >>> center_offsets_batch([(1000, 600)])
+        [(460, 240)]
+    """
+    return [((target_width - w) // 2, (target_height - h) // 2) for w, h in sizes]
 
-# 既存の実装をインポート
 
-# 既存の実装をインポート
-from .advanced_video_concatenator import (
-    TransitionMode,
-    VideoSegment, 
-    Transition,
-    concatenate_videos_advanced,
-    get_video_duration,
-    calculate_sequence_duration,
-    CrossfadeEffect,
-    CrossfadeOutputMode,
-    create_crossfade_video
-)
-# from video_mixer import mix_video_with_image  # TODO: 実装が必要
+def prescale_image(image_path: str, size: tuple[int, int], directory: str) -> str:
+    """静止画をあらかじめ指定サイズに縮小したPNGとして書き出す
+    
+    ループ入力の静止画に scale フィルターをかけると出力フレームごとに
+    縮小処理が走るため、FFmpegに渡す前に1回だけ縮小しておく。
+    
+    Args:
+        image_path: 元の画像ファイルのパス
+        size: 縮小後の (幅, 高さ)
+        directory: 縮小した画像を書き出すディレクトリ
+        
+    Returns:
+        str: FFmpegに渡す画像のパス（元のサイズのままでよい場合は image_path）
+    """
+    if get_image_dimensions(image_path) == size:
+        return image_path
+    
+    from PIL import Image
+    with Image.open(image_path) as img:
+        # パレット画像などはそのままでは補間できないため、透過の有無に応じて変換する
+        if img.mode not in ('RGB', 'RGBA'):
+            has_alpha = img.mode in ('LA', 'PA', 'La') or 'transparency' in img.info
+            img = img.convert('RGBA' if has_alpha else 'RGB')
+        resized = img.resize(size, Image.LANCZOS)
+    
+    fd, output_path = tempfile.mkstemp(suffix='.png', prefix='movie_mix_overlay_', dir=directory)
+    os.close(fd)
+    resized.save(output_path)
+    return output_path
 
 
 class VideoProcessingError(Exception):
@@ -178,6 +254,84 @@ class VideoProcessingError(Exception):
     pass
 
 
+# VideoInfo に必要なffprobeの項目（最初の映像ストリームと長さのみ）
+# profile 以降はストリームコピーで連結できるかの判定に使う（extradata_hash は -show_data_hash 指定時のみ出力される）
+_VIDEO_INFO_ENTRIES = ('stream=codec_name,width,height,pix_fmt,r_frame_rate,'
+                       'profile,level,time_base,extradata_hash:format=duration')
+
+
+def _ffprobe_entries(path: str) -> dict[str, str]:
+    """ffprobeで VideoInfo に必要な項目だけを取得する
+    
+    -show_entries で取得項目を絞り、JSONを介さず key=value 形式で受け取る。
+    
+    Args:
+        path: 動画ファイルのパス
+        
+    Returns:
+        dict[str, str]: 項目名と値の辞書（例: {"width": "1920", "duration": "5.000000"}）
+        
+    Raises:
+        ffmpeg.Error: ffprobeの実行に失敗した場合
+    """
+    result = subprocess.run(['ffprobe', '-v', 'error', '-select_streams', 'v:0',
+                             '-show_entries', _VIDEO_INFO_ENTRIES, '-show_data_hash', 'sha256',
+                             '-of', 'default=noprint_wrappers=1', path],
+                            capture_output=True, text=True, check=False)
+    if result.returncode != 0:
+        raise ffmpeg.Error('ffprobe', result.stdout, result.stderr)
+    
+    entries = {}
+    for line in result.stdout.splitlines():
+        key, sep, value = line.partition('=')
+        if sep:
+            entries[key] = value
+    return entries
+
+
+@functools.lru_cache(maxsize=256)
+def _probe_video_info(path: str, mtime_ns: int, size: int) -> tuple[float, int, int, float | None, str | None, str | None,
+                                                                   str | None, int | None, str | None, str | None]:
+    """ffprobeで動画の長さ・解像度・フレームレート・コーデック・ピクセルフォーマットなどを取得する
+    
+    更新時刻とサイズをキーに含めてキャッシュするため、同じファイルへの
+    繰り返しの問い合わせではffprobeを起動せず、ファイルが更新された場合は
+    再取得する。
+    
+    Args:
+        path: 動画ファイルのパス
+        mtime_ns: ファイルの更新時刻（ナノ秒）
+        size: ファイルサイズ（バイト）
+        
+    Returns:
+        tuple[float, int, int, float | None, str | None, str | None, str | None, int | None, str | None, str | None]:
+            (長さ, 幅, 高さ, フレームレート, コーデック, ピクセルフォーマット,
+            プロファイル, レベル, タイムベース, コーデック固有データのハッシュ)
+    """
+    entries = _ffprobe_entries(path)
+    
+    # フレームレートを安全に解析（ffprobeは "30000/1001" のような整数比で返す。
+    # 不明な場合は "0/0"）
+    num, _, den = entries['r_frame_rate'].partition('/')
+    if den:
+        fps = int(num) / int(den) if int(den) != 0 else None
+    else:
+        fps = float(num)
+    
+    return (
+        float(entries['duration']),
+        int(entries['width']),
+        int(entries['height']),
+        fps,
+        entries.get('codec_name'),
+        entries.get('pix_fmt'),
+        entries.get('profile'),
+        int(entries['level']) if entries.get('level', '').lstrip('-').isdigit() else None,
+        entries.get('time_base'),
+        entries.get('extradata_hash')
+    )
+
+
 @dataclass
 class VideoInfo:
     """動画ファイル情報を格納するデータクラス
@@ -188,6 +342,12 @@ class VideoInfo:
         width: 動画の幅（ピクセル）
         height: 動画の高さ（ピクセル）
         fps: フレームレート（fps）
+        codec: ビデオコーデック名（例: "h264"）
+        pix_fmt: ピクセルフォーマット（例: "yuv420p"）
+        profile: コーデックのプロファイル（例: "High"）
+        level: コーデックのレベル（例: 42）
+        time_base: 映像ストリームのタイムベース（例: "1/15360"）
+        extradata_hash: コーデック固有データ（H.264ではSPS/PPS）のハッシュ
     """
     path: str
     duration: float
@@ -195,6 +355,12 @@ class VideoInfo:
     height: int | None = None
     fps: float | None = None
     size_mb: float | None = None
+    codec: str | None = None
+    pix_fmt: str | None = None
+    profile: str | None = None
+    level: int | None = None
+    time_base: str | None = None
+    extradata_hash: str | None = None
 
     @classmethod
     def from_path(cls, path: str) -> VideoInfo:
@@ -214,26 +380,51 @@ class VideoInfo:
             >>> print(f"Duration: {info.duration}s, Resolution: {info.width}x{info.height}")
         """
         try:
-            probe = ffmpeg.probe(path)
-            video_stream = next(s for s in probe['streams'] if s['codec_type'] == 'video')
-            
-            # フレームレートを安全に解析
-            frame_rate_str = video_stream['r_frame_rate']
-            if '/' in frame_rate_str:
-                num, den = frame_rate_str.split('/')
-                fps = float(num) / float(den) if float(den) != 0 else None
-            else:
-                fps = float(frame_rate_str)
+            st = os.stat(path)
+            (duration, width, height, fps, codec, pix_fmt,
+             profile, level, time_base, extradata_hash) = _probe_video_info(path, st.st_mtime_ns, st.st_size)
             
             return cls(
                 path=path,
-                duration=float(probe['format']['duration']),
-                width=int(video_stream['width']),
-                height=int(video_stream['height']),
-                fps=fps
+                duration=duration,
+                width=width,
+                height=height,
+                fps=fps,
+                codec=codec,
+                pix_fmt=pix_fmt,
+                profile=profile,
+                level=level,
+                time_base=time_base,
+                extradata_hash=extradata_hash
             )
         except Exception as e:
             raise VideoProcessingError(f"動画情報の取得に失敗しました: {path} - {e}")
+    
+    @staticmethod
+    def cache_clear() -> None:
+        """from_path と probe_video の取得結果キャッシュを破棄する
+        
+        Examples:
+            >>> VideoInfo.cache_clear()
+        """
+        _probe_video_info.cache_clear()
+        _probe_file.cache_clear()
+
+
+@dataclass
+class MixSpec:
+    """動画・画像ミックス1件分の指定を格納するデータクラス
+    
+    Attributes:
+        background_video: 背景動画のファイルパス
+        overlay_image: オーバーレイする画像のファイルパス
+        output_path: 出力動画ファイルのパス
+        duration: 出力動画の長さ（秒）
+    """
+    background_video: str
+    overlay_image: str
+    output_path: str
+    duration: float = 30.0
 
 
 class VideoProcessor:
@@ -246,18 +437,47 @@ class VideoProcessor:
         default_width: デフォルト出力幅（ピクセル）
         default_height: デフォルト出力高さ（ピクセル）
         default_fps: デフォルトフレームレート（fps）
+        threads: FFmpeg 1回の実行あたりのスレッド数（None の場合はFFmpegの既定値）
+        encoding_profile: エンコードプロファイル名（None の場合は通常の品質設定）
+        hw_accel: ミックス処理のハードウェアアクセラレーション指定（"cuda"/"cpu"/"auto"）
+        decoder_threads: 入力デコードのスレッド数（None の場合は threads またはCPUコア数）
+        encoder_threads: 出力エンコードのスレッド数（None の場合は threads またはCPUコア数）
+        hevc_fast: 再エンコードする出力を libx265（WPP・フレーム並列有効）で生成するかどうか
     """
     
     def __init__(self, 
                  default_width: int = 1920,
                  default_height: int = 1080,
-                 default_fps: int = 30) -> None:
+                 default_fps: int = 30,
+                 threads: int | None = None,
+                 encoding_profile: str | None = None,
+                 hw_accel: Literal["cuda", "cpu", "auto"] = "auto",
+                 decoder_threads: int | None = None,
+                 encoder_threads: int | None = None,
+                 hevc_fast: bool = False) -> None:
         """VideoProcessorを初期化する
         
         Args:
             default_width: デフォルト出力幅（ピクセル）
             default_height: デフォルト出力高さ（ピクセル）
             default_fps: デフォルトフレームレート（fps）
+            threads: FFmpeg 1回の実行あたりのスレッド数。複数のFFmpegを
+                並列実行する場合に指定するとコアの過剰割り当てを防げる
+            encoding_profile: エンコードプロファイル名。"fast" を指定すると
+                品質より処理速度を優先する（テスト用途向け）。"throughput" は
+                libx264 を veryfast/fastdecode で使い、中間ファイルの生成を速くする
+            hw_accel: ミックス処理のハードウェアアクセラレーション。"cuda" は
+                NVDEC/NVENCでデコードからエンコードまでGPU上で処理し、"cpu" は
+                常にソフトウェア処理を行う。"auto" はFFmpegの対応状況から自動判定する
+            decoder_threads: 各入力のデコードに使うスレッド数（-i の前の -threads）
+            encoder_threads: 出力のエンコードに使うスレッド数（出力側の -threads）。
+                どちらも省略時は threads、MOVIE_MIX_FFMPEG_THREADS、CPUコア数の順で決まる
+            hevc_fast: True の場合、再エンコードする出力をハードウェアエンコーダではなく
+                libx265 で生成する。WPPとフレーム並列を有効にし、エンコードのスレッド数
+                だけコアを使う（ストリームコピーで連結できる場合は入力の形式のまま）
+        
+        Raises:
+            ValueError: 未知のエンコードプロファイルまたはhw_accelが指定された場合
         
         Examples:
             >>> processor = VideoProcessor(default_width=3840, default_height=2160)
@@ -267,6 +487,24 @@ class VideoProcessor:
         self.default_width = default_width
         self.default_height = default_height
         self.default_fps = default_fps
+        self.threads = threads
+        # 未知のプロファイルは生成時に検出する
+        get_encoding_params(encoding_profile, 'libx264')
+        self.encoding_profile = encoding_profile
+        if hw_accel not in ("cuda", "cpu", "auto"):
+            raise ValueError(f"hw_accelには 'cuda', 'cpu', 'auto' のいずれかを指定してください: {hw_accel}")
+        self.hw_accel = hw_accel
+        self.decoder_threads = decoder_threads
+        self.encoder_threads = encoder_threads
+        self.hevc_fast = hevc_fast
+    
+    def _resolve_threads(self, threads: int | None) -> int:
+        """個別指定、threads、環境変数、CPUコア数の順でスレッド数を決定する"""
+        return get_ffmpeg_threads(threads or self.threads) or os.cpu_count() or 1
+    
+    def _output_codec(self) -> str:
+        """再エンコードする出力のビデオコーデックを決定する"""
+        return 'libx265' if self.hevc_fast else DEFAULT_VIDEO_CODEC
     
     def get_video_info(self, path: str) -> VideoInfo:
         """動画ファイルの情報を取得する
@@ -289,12 +527,22 @@ class VideoProcessor:
     
     def concatenate_videos(self, 
                           sequence: list[VideoSegment | Transition], 
-                          output_path: str) -> VideoInfo:
+                          output_path: str,
+                          progress_callback: ProgressCallback | None = None) -> VideoInfo:
         """動画を連結する
         
+        すべてのトランジションが単純結合で、すべての動画のコーデック・解像度・
+        フレームレート・ピクセルフォーマットに加え、プロファイル・レベル・
+        コーデック固有データ・タイムベースが一致する場合は、再エンコードせずに
+        ストリームコピーで連結する（入力の形式がそのまま出力される）。
+        クロスフェイド(増加あり)を含む場合も、H.264の動画であれば
+        クロスフェイド区間だけをエンコードし、動画本体はストリームコピーする。
+        
         Args:
             sequence: 動画セグメントとトランジションのリスト
             output_path: 出力ファイルパス
+            progress_callback: エンコードの進捗の通知先（FFmpegの -progress の値を辞書で受け取る）。
+                ストリームコピーで連結する場合は連結の進捗を通知する
             
         Returns:
             VideoInfo: 生成された動画の情報
@@ -309,16 +557,130 @@ class VideoProcessor:
             >>> print(f"Output duration: {result.duration}s")
         """
         try:
-            concatenate_videos_advanced(sequence, output_path)
+            stream_copy_format = self._get_stream_copy_format(sequence)
+            if stream_copy_format is None:
+                concatenate_videos_advanced(sequence, output_path,
+                                            threads=self._resolve_threads(self.encoder_threads),
+                                            encoding_profile=self.encoding_profile,
+                                            decoder_threads=self._resolve_threads(self.decoder_threads),
+                                            progress_callback=progress_callback,
+                                            vcodec=self._output_codec())
+            elif all(item.mode == TransitionMode.NONE for item in sequence if isinstance(item, Transition)):
+                concatenate_videos_stream_copy(
+                    [item.path for item in sequence if isinstance(item, VideoSegment)], output_path,
+                    progress_callback=progress_callback)
+            else:
+                concatenate_videos_hybrid(sequence, output_path,
+                                          width=stream_copy_format.width,
+                                          height=stream_copy_format.height,
+                                          fps=stream_copy_format.fps,
+                                          pix_fmt=stream_copy_format.pix_fmt,
+                                          threads=self._resolve_threads(self.encoder_threads),
+                                          encoding_profile=self.encoding_profile,
+                                          profile=stream_copy_format.profile,
+                                          level=stream_copy_format.level,
+                                          time_base=stream_copy_format.time_base,
+                                          progress_callback=progress_callback)
             return self.get_video_info(output_path)
         except Exception as e:
             raise VideoProcessingError(f"動画連結に失敗しました: {e}")
     
+    def concatenate_videos_parallel(self,
+                                    sequences: list[list[VideoSegment | Transition]],
+                                    output_paths: list[str],
+                                    max_workers: int = 2) -> list[VideoInfo]:
+        """互いに独立した複数の連結処理を並列に実行する
+        
+        各連結は別々のFFmpegプロセスで処理される。スレッド数を指定していない
+        場合は、CPUコアを並列数で等分して各FFmpegに割り当てる。
+        
+        Args:
+            sequences: 連結するシーケンスのリスト
+            output_paths: 各シーケンスの出力ファイルパス（sequences と同じ順序）
+            max_workers: 同時に実行するFFmpegの数
+            
+        Returns:
+            list[VideoInfo]: 生成された動画の情報（sequences と同じ順序）
+            
+        Raises:
+            ValueError: sequences と output_paths の数が一致しない場合
+            VideoProcessingError: いずれかの連結が失敗した場合
+            
+        Examples:
+            >>> processor = VideoProcessor()
+            >>> results = processor.concatenate_videos_parallel(
+            ...     [sequence1, sequence2], ["output1.mp4", "output2.mp4"]
+            ... )
+        """
+        if len(sequences) != len(output_paths):
+            raise ValueError("sequences と output_paths の数が一致しません")
+        
+        # 並列実行するFFmpeg同士でCPUコアを取り合わないようにする
+        worker = copy.copy(self)
+        if get_ffmpeg_threads(self.threads) is None:
+            worker.threads = max(1, (os.cpu_count() or 1) // max_workers)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(worker.concatenate_videos, sequence, output_path)
+                       for sequence, output_path in zip(sequences, output_paths)]
+            return [future.result() for future in futures]
+    
+    def concatenate_videos_batch(self,
+                                 sequences: list[list[VideoSegment | Transition]],
+                                 output_paths: list[str]) -> list[VideoInfo]:
+        """複数の連結を1回のFFmpeg実行でまとめて処理する
+        
+        各シーケンスを独立したフィルターチェーンと出力として1つのコマンドに
+        まとめるため、FFmpegの起動・フィルターグラフやハードウェアデバイスの
+        初期化が連結ごとに繰り返されない。短いクリップを続けて処理する場合に
+        有効。ストリームコピーによる連結は行わず、常にエンコードする。
+        
+        Args:
+            sequences: 連結するシーケンスのリスト
+            output_paths: 各シーケンスの出力ファイルパス（sequences と同じ順序）
+        
+        Returns:
+            list[VideoInfo]: 生成された動画の情報（sequences と同じ順序）
+        
+        Raises:
+            ValueError: sequences と output_paths の数が一致しない場合
+            VideoProcessingError: 処理が失敗した場合
+        
+        Examples:
+            >>> processor = VideoProcessor()
+            >>> results = processor.concatenate_videos_batch(
+            ...     [sequence1, sequence2], ["output1.mp4", "output2.mp4"]
+            ... )
+        """
+        if len(sequences) != len(output_paths):
+            raise ValueError("sequences と output_paths の数が一致しません")
+        if not sequences:
+            return []
+        
+        try:
+            # 同じ動画は全シーケンスで1回だけ入力として開き、ラベルはシーケンスごとに分ける
+            input_indexes: dict[str, int] = {}
+            input_args: list[str] = []
+            filter_graphs: list[str] = []
+            output_args: list[str] = []
+            for n, (sequence, output_path) in enumerate(zip(sequences, output_paths)):
+                _, inputs, filter_graph, outputs = self._build_pipeline_output(
+                    sequence, output_path, input_indexes=input_indexes, label_prefix=f'o{n}_')
+                input_args += inputs
+                filter_graphs.append(filter_graph)
+                output_args += outputs
+            run_ffmpeg_args(['ffmpeg', '-y', *input_args, '-filter_complex', ';'.join(filter_graphs),
+                             *output_args], quiet=False)
+            return [self.get_video_info(output_path) for output_path in output_paths]
+        except Exception as e:
+            raise VideoProcessingError(f"動画連結に失敗しました: {e}")
+    
     def mix_video_with_image(self,
                            background_video: str,
                            overlay_image: str, 
                            output_path: str,
-                           duration: float = 30.0) -> VideoInfo:
+                           duration: float = 30.0,
+                           progress_callback: ProgressCallback | None = None) -> VideoInfo:
         """動画と画像をミックスして新しい動画を生成する
         
         背景動画の上に画像をオーバーレイして、指定した長さの動画を生成する。
@@ -328,6 +690,7 @@ class VideoProcessor:
             overlay_image: オーバーレイする画像のファイルパス
             output_path: 出力動画ファイルのパス
             duration: 出力動画の長さ（秒）
+            progress_callback: エンコードの進捗の通知先（FFmpegの -progress の値を辞書で受け取る）
             
         Returns:
             VideoInfo: 生成された動画の情報
@@ -342,96 +705,225 @@ class VideoProcessor:
             ... )
             >>> print(f"Mixed video created: {result.path}")
         """
-        try:
-            # 静止画のサイズを取得
-            from PIL import Image
-            with Image.open(overlay_image) as img:
-                img_width, img_height = img.size
-            
-            # スケーリング後のサイズを計算
-            aspect_ratio = img_width / img_height
-            target_aspect = 1920 / 1080
-            
-            if aspect_ratio > target_aspect:
-                scaled_width = 1920
-                scaled_height = int(1920 / aspect_ratio)
-            else:
-                scaled_height = 1080
-                scaled_width = int(1080 * aspect_ratio)
+        [result] = self.mix_video_with_image_batch(
+            [MixSpec(background_video, overlay_image, output_path, duration)],
+            progress_callback=progress_callback
+        )
+        return result
+    
+    def mix_video_with_image_batch(self, cases: list[MixSpec],
+                                   progress_callback: ProgressCallback | None = None) -> list[VideoInfo]:
+        """複数の動画・画像ミックスを1回のFFmpeg実行でまとめて生成する
+        
+        各ミックスを独立したフィルターチェーンと出力として1つのコマンドに
+        まとめるため、FFmpegの起動やハードウェアエンコーダの初期化が
+        ミックスごとに繰り返されない。
+        
+        Args:
+            cases: ミックス指定のリスト
+            progress_callback: エンコードの進捗の通知先（FFmpegの -progress の値を辞書で受け取る）
             
-            # 中央配置のオフセット計算
-            x_offset = (1920 - scaled_width) // 2
-            y_offset = (1080 - scaled_height) // 2
+        Returns:
+            list[VideoInfo]: 生成された動画の情報（cases と同じ順序）
+            
+        Raises:
+            VideoProcessingError: 処理が失敗した場合
+            
+        Examples:
+            >>> processor = VideoProcessor()
+            >>> results = processor.mix_video_with_image_batch([
+            ...     MixSpec("bg1.mp4", "title1.png", "out1.mp4", duration=5),
+            ...     MixSpec("bg2.mp4", "title2.png", "out2.mp4", duration=8),
+            ... ])
+        """
+        if not cases:
+            return []
+        
+        prescale_dir = tempfile.TemporaryDirectory(prefix='movie_mix_overlay_')
+        try:
+            # 静止画のサイズからスケーリング後のサイズと中央配置のオフセットをまとめて計算
+            scaled_sizes = scale_to_fit_batch([get_image_dimensions(case.overlay_image) for case in cases], 1920, 1080)
+            offsets = center_offsets_batch(scaled_sizes, 1920, 1080)
+            # 不透明な画像が画面全体を覆う場合は背景が見えないため合成を省略する
+            covered = [size == (1920, 1080) and is_opaque_image(case.overlay_image)
+                       for case, size in zip(cases, scaled_sizes)]
+            # 画像はFFmpegに渡す前に1回だけ縮小しておく（フレームごとの scale を避ける）
+            overlay_cases = [replace(case, overlay_image=prescale_image(case.overlay_image, size, prescale_dir.name))
+                             for case, size in zip(cases, scaled_sizes)]
+            layouts = list(zip(overlay_cases, offsets, covered))
             
             # FFmpegでの処理
             import ffmpeg
             
-            def _try_hardware_mix():
-                """ハードウェアアクセラレーション版でミックス処理"""
-                # 背景動画のストリーム作成
-                if DEFAULT_HWACCEL:
-                    background = ffmpeg.input(background_video, stream_loop=-1, t=duration, hwaccel=DEFAULT_HWACCEL).video
-                else:
-                    background = ffmpeg.input(background_video, stream_loop=-1, t=duration).video
-                
-                # オーバーレイ画像のストリーム作成
-                overlay = ffmpeg.input(overlay_image, loop=1, t=duration).filter('scale', scaled_width, scaled_height)
-                
-                # オーバーレイ合成
-                combined = ffmpeg.overlay(background, overlay, x=x_offset, y=y_offset)
-                
-                # 出力設定
-                out = ffmpeg.output(combined, output_path, 
-                                   vcodec=DEFAULT_VIDEO_CODEC, 
-                                   pix_fmt='yuv420p',
-                                   r=30,
-                                   b='5M')  # 5Mbps高品質設定
+            # スレッド数指定（デコードは各入力、エンコードは出力に設定）
+            decoder_params = {'threads': self._resolve_threads(self.decoder_threads)}
+            thread_params = {'threads': self._resolve_threads(self.encoder_threads),
+                             'thread_type': 'slice+frame'}
+            
+            # ソフトウェアエンコード時の画質設定（プロファイル指定時は上書き）
+            if self.hevc_fast:
+                software_params = {
+                    'vcodec': 'libx265',
+                    'crf': 18,
+                    **get_x265_params(thread_params['threads']),
+                    **get_encoding_params(self.encoding_profile, 'libx265'),
+                }
+            else:
+                software_params = {
+                    'vcodec': 'libx264',
+                    'crf': 18,  # 高品質設定 (18-23が推奨)
+                    'preset': 'slow',  # 品質重視
+                    **get_encoding_params(self.encoding_profile, 'libx264'),
+                }
+            
+            # NVENCエンコード時の設定（プロファイル指定時は上書き）
+            nvenc_params = {
+                'preset': 'p4',
+                **get_encoding_params(self.encoding_profile, 'h264_nvenc'),
+            }
+            
+            def _covering_still(case):
+                """画面全体を覆う画像だけの映像ストリームを作成する"""
+                return ffmpeg.input(case.overlay_image, loop=1, t=case.duration, framerate=30, **decoder_params)
+            
+            def _run_outputs(outputs, global_args=()):
+                """すべての出力を1つのコマンドにまとめて実行する"""
+                out = outputs[0] if len(outputs) == 1 else ffmpeg.merge_outputs(*outputs)
+                if global_args:
+                    out = out.global_args(*global_args)
                 
                 # 既存ファイルがあれば上書き
                 out = ffmpeg.overwrite_output(out)
                 
                 # 実行
-                ffmpeg.run(out, quiet=False)
+                run_ffmpeg(out, quiet=False, progress_callback=progress_callback)
+            
+            def _try_hardware_mix():
+                """ハードウェアアクセラレーション版でミックス処理"""
+                outputs = []
+                for case, (x_offset, y_offset), covered in layouts:
+                    if covered:
+                        # 画像が画面全体を不透明に覆うため、背景動画はデコードしない
+                        combined = _covering_still(case)
+                    else:
+                        # 背景動画のストリーム作成
+                        if DEFAULT_HWACCEL:
+                            background = ffmpeg.input(case.background_video, stream_loop=-1, t=case.duration,
+                                                      hwaccel=DEFAULT_HWACCEL, **decoder_params).video
+                        else:
+                            background = ffmpeg.input(case.background_video, stream_loop=-1, t=case.duration,
+                                                      **decoder_params).video
+                        
+                        # オーバーレイ画像のストリーム作成
+                        overlay = ffmpeg.input(case.overlay_image, loop=1, t=case.duration,
+                                               framerate=OVERLAY_IMAGE_FRAMERATE, **decoder_params)
+                        
+                        # オーバーレイ合成
+                        combined = ffmpeg.overlay(background, overlay, x=x_offset, y=y_offset)
+                    
+                    # 出力設定
+                    outputs.append(ffmpeg.output(combined, case.output_path, 
+                                                 vcodec=DEFAULT_VIDEO_CODEC, 
+                                                 pix_fmt='yuv420p',
+                                                 r=30,
+                                                 b='5M',  # 5Mbps高品質設定
+                                                 **get_encoding_params(self.encoding_profile, DEFAULT_VIDEO_CODEC),
+                                                 **thread_params))
+                
+                _run_outputs(outputs)
+            
+            def _try_cuda_mix():
+                """CUDA版でミックス処理（デコード・合成・エンコードをGPUメモリ上で完結させる）"""
+                outputs = []
+                for case, (x_offset, y_offset), covered in layouts:
+                    if covered:
+                        # 画像が画面全体を不透明に覆うため、背景動画はデコードしない
+                        combined = _covering_still(case)
+                    else:
+                        # 背景動画のストリーム作成（デコード結果をGPUメモリに保持）
+                        # overlay_cuda でアルファ付き画像を重ねるため、GPU上で yuv420p に変換する
+                        background = (ffmpeg.input(case.background_video, stream_loop=-1, t=case.duration,
+                                                   hwaccel='cuda', hwaccel_output_format='cuda', **decoder_params)
+                                      .video
+                                      .filter('scale_cuda', format='yuv420p'))
+                        
+                        # オーバーレイ画像のストリーム作成（縮小済みの画像をGPUへアップロード）
+                        overlay = (ffmpeg.input(case.overlay_image, loop=1, t=case.duration,
+                                                framerate=OVERLAY_IMAGE_FRAMERATE, **decoder_params)
+                                   .filter('format', 'yuva420p')
+                                   .filter('hwupload_cuda'))
+                        
+                        # オーバーレイ合成（GPU上、画像の最後のフレームを背景の終わりまで使い続ける）
+                        combined = ffmpeg.filter([background, overlay], 'overlay_cuda',
+                                                 x=x_offset, y=y_offset, eof_action='repeat')
+                    
+                    # 出力設定（NVENC）
+                    outputs.append(ffmpeg.output(combined, case.output_path,
+                                                 vcodec='h264_nvenc',
+                                                 r=30,
+                                                 b='5M',
+                                                 **nvenc_params,
+                                                 **thread_params))
+                
+                # CUDAデバイスは全出力で共有する
+                _run_outputs(outputs, ('-init_hw_device', 'cuda=cu:0', '-filter_hw_device', 'cu'))
             
             def _try_software_mix():
                 """ソフトウェアフォールバック版でミックス処理"""
                 print(f"⚠️ ハードウェア処理が失敗しました。ソフトウェアエンコーダーで再処理します。")
                 
-                # 背景動画のストリーム作成（ハードウェアアクセラレーションなし）
-                background = ffmpeg.input(background_video, stream_loop=-1, t=duration).video
-                
-                # オーバーレイ画像のストリーム作成
-                overlay = ffmpeg.input(overlay_image, loop=1, t=duration).filter('scale', scaled_width, scaled_height)
-                
-                # オーバーレイ合成
-                combined = ffmpeg.overlay(background, overlay, x=x_offset, y=y_offset)
-                
-                # 出力設定（ソフトウェアエンコーダー）
-                out = ffmpeg.output(combined, output_path, 
-                                   vcodec='libx264',  # ソフトウェアエンコーダー
-                                   pix_fmt='yuv420p',
-                                   r=30,
-                                   crf=18,  # 高品質設定 (18-23が推奨)
-                                   preset='slow')  # 品質重視
-                
-                # 既存ファイルがあれば上書き
-                out = ffmpeg.overwrite_output(out)
+                outputs = []
+                for case, (x_offset, y_offset), covered in layouts:
+                    if covered:
+                        # 画像が画面全体を不透明に覆うため、背景動画はデコードしない
+                        combined = _covering_still(case)
+                    else:
+                        # 背景動画のストリーム作成（ハードウェアアクセラレーションなし）
+                        background = ffmpeg.input(case.background_video, stream_loop=-1, t=case.duration,
+                                                  **decoder_params).video
+                        
+                        # オーバーレイ画像のストリーム作成
+                        overlay = ffmpeg.input(case.overlay_image, loop=1, t=case.duration,
+                                               framerate=OVERLAY_IMAGE_FRAMERATE, **decoder_params)
+                        
+                        # オーバーレイ合成
+                        combined = ffmpeg.overlay(background, overlay, x=x_offset, y=y_offset)
+                    
+                    # 出力設定（ソフトウェアエンコーダー）
+                    outputs.append(ffmpeg.output(combined, case.output_path, 
+                                                 pix_fmt='yuv420p',
+                                                 r=30,
+                                                 **software_params,
+                                                 **thread_params))
                 
-                # 実行
-                ffmpeg.run(out, quiet=False)
+                _run_outputs(outputs)
 
+            # 使用する処理経路を決定（HEVC指定時は常にソフトウェアエンコーダー）
+            if self.hevc_fast:
+                use_cuda = use_hardware = False
+            elif self.hw_accel == 'cuda':
+                use_cuda = use_hardware = True
+            elif self.hw_accel == 'cpu':
+                use_cuda = use_hardware = False
+            else:
+                use_hardware = bool(DEFAULT_HWACCEL) and DEFAULT_VIDEO_CODEC != 'libx264'
+                use_cuda = use_hardware and DEFAULT_VIDEO_CODEC == 'h264_nvenc' and is_nvenc_available()
+            
             try:
                 # ハードウェアアクセラレーション有効時の処理
-                if DEFAULT_HWACCEL and DEFAULT_VIDEO_CODEC != 'libx264':
+                if use_cuda:
+                    print(f"🎬 CUDA/NVENCでミックス処理開始...")
+                    _try_cuda_mix()
+                elif use_hardware:
                     print(f"🎬 ハードウェアアクセラレーション({DEFAULT_VIDEO_CODEC})でミックス処理開始...")
                     _try_hardware_mix()
                 else:
-                    print(f"🔧 ソフトウェアエンコーダー(libx264)でミックス処理開始...")
+                    print(f"🔧 ソフトウェアエンコーダー({software_params['vcodec']})でミックス処理開始...")
                     _try_software_mix()
                     
             except ffmpeg.Error as hw_error:
                 # ハードウェア処理が失敗した場合のフォールバック
-                if DEFAULT_HWACCEL and DEFAULT_VIDEO_CODEC != 'libx264':
+                if use_hardware:
                     try:
                         _try_software_mix()
                     except ffmpeg.Error as sw_error:
@@ -443,18 +935,224 @@ class VideoProcessor:
             
             # 結果情報を作成
             import os
-            file_size_mb = os.path.getsize(output_path) / (1024 * 1024)
-            
-            return VideoInfo(
-                path=output_path,
-                duration=float(duration),
-                width=1920,
-                height=1080,
-                fps=30.0,
-                size_mb=file_size_mb
-            )
+            return [
+                VideoInfo(
+                    path=case.output_path,
+                    duration=float(case.duration),
+                    width=1920,
+                    height=1080,
+                    fps=30.0,
+                    size_mb=os.path.getsize(case.output_path) / (1024 * 1024)
+                )
+                for case in cases
+            ]
         except Exception as e:
             raise VideoProcessingError(f"動画・画像ミックスに失敗しました: {e}")
+        finally:
+            prescale_dir.cleanup()
+    
+    def _get_stream_copy_format(self, sequence: list[VideoSegment | Transition]) -> VideoInfo | None:
+        """動画本体を再エンコードなしで連結できるシーケンスなら、共通の動画形式を返す
+        
+        Args:
+            sequence: 動画セグメントとトランジションのリスト
+            
+        Returns:
+            VideoInfo | None: 先頭の動画の情報（ストリームコピーできない場合は None）
+        """
+        if not sequence or not isinstance(sequence[0], VideoSegment):
+            return None
+        
+        # 動画を短縮するクロスフェイドはフィルター処理が必要
+        transition_modes = {item.mode for item in sequence if isinstance(item, Transition)}
+        if not transition_modes <= {TransitionMode.NONE, TransitionMode.CROSSFADE_INCREASE}:
+            return None
+        
+        paths = [item.path for item in sequence if isinstance(item, VideoSegment)]
+        try:
+            infos = [VideoInfo.from_path(path) for path in paths]
+        except VideoProcessingError:
+            return None
+        
+        formats = {(info.codec, info.width, info.height, info.fps, info.pix_fmt) for info in infos}
+        if len(formats) != 1 or None in next(iter(formats)):
+            return None
+        
+        # MP4に連結するとコーデック固有データ（H.264のSPS/PPS）は先頭の動画のものだけが
+        # 残るため、プロファイル・レベル・コーデック固有データ・タイムベースも一致する必要がある
+        stream_parameters = {(info.profile, info.level, info.extradata_hash, info.time_base) for info in infos}
+        if len(stream_parameters) != 1:
+            return None
+        
+        # クロスフェイド区間は動画本体と同じプロファイルのH.264（libx264）でエンコードするため、
+        # 動画本体もlibx264で出力できるプロファイルのH.264である必要がある
+        # （HEVCで再エンコードする指定の場合は、クロスフェイドを含むシーケンス全体をエンコードする）
+        if TransitionMode.CROSSFADE_INCREASE in transition_modes and (
+                infos[0].codec != 'h264' or infos[0].profile not in X264_PROFILES or self.hevc_fast):
+            return None
+        return infos[0]
+    
+    def _build_pipeline_output(self,
+                               sequence: list[VideoSegment | Transition],
+                               output_path: str,
+                               overlay_image: str | None = None,
+                               duration: float | None = None,
+                               prescale_dir: str | None = None,
+                               input_indexes: dict[str, int] | None = None,
+                               label_prefix: str = '') -> tuple[list[str], list[str], str, list[str]]:
+        """連結とオーバーレイを1つのフィルターグラフにまとめた出力のコマンド引数を構築する
+        
+        prescale_dir を指定すると、縮小済みの画像をそこに書き出してオーバーレイに使う
+        （FFmpegの実行が終わるまでディレクトリを残しておくこと）。input_indexes と
+        label_prefix は build_concat_filter_complex と同じく、複数の出力を1つの
+        コマンドにまとめる場合に使う。
+        
+        Returns:
+            tuple[list[str], list[str], str, list[str]]: グローバルオプション、入力の引数、
+                filter_complex の文字列、出力の引数
+        """
+        decoder_threads = self._resolve_threads(self.decoder_threads)
+        if input_indexes is None:
+            input_indexes = {}
+        input_args, filter_graph, video = build_concat_filter_complex(
+            sequence, decoder_threads=decoder_threads, input_indexes=input_indexes, label_prefix=label_prefix)
+        filter_chains = [filter_graph]
+        global_args: list[str] = []
+        
+        # NVENCで出力する場合はオーバーレイもGPU上で合成し、エンコーダーへ
+        # 渡すまでフレームをGPUメモリに置いたままにする
+        use_cuda = overlay_image is not None and not self.hevc_fast and (
+            self.hw_accel == 'cuda'
+            or (self.hw_accel == 'auto' and DEFAULT_VIDEO_CODEC == 'h264_nvenc' and is_nvenc_available()))
+        
+        if overlay_image is not None:
+            # 静止画のサイズからスケーリング後のサイズと中央配置のオフセットを計算
+            [(scaled_width, scaled_height)] = scale_to_fit_batch([get_image_dimensions(overlay_image)], 1920, 1080)
+            [(x_offset, y_offset)] = center_offsets_batch([(scaled_width, scaled_height)], 1920, 1080)
+            
+            # 連結結果に直接オーバーレイする（中間ファイルを作らない）
+            overlay_filters = []
+            if prescale_dir is not None:
+                overlay_image = prescale_image(overlay_image, (scaled_width, scaled_height), prescale_dir)
+            else:
+                overlay_filters.append(f'scale={scaled_width}:{scaled_height}')
+            overlay_index = len(input_indexes)
+            input_indexes[overlay_image] = overlay_index
+            input_args += ['-framerate', str(OVERLAY_IMAGE_FRAMERATE), '-loop', '1',
+                           '-threads', str(decoder_threads), '-i', overlay_image]
+            overlay = f'{overlay_index}:v'
+            overlay_filter = 'overlay'
+            if use_cuda:
+                filter_chains.append(f'[{video}]format=yuv420p,hwupload_cuda[{label_prefix}main]')
+                overlay_filters += ['format=yuva420p', 'hwupload_cuda']
+                video = f'{label_prefix}main'
+                overlay_filter = 'overlay_cuda'
+                global_args += ['-init_hw_device', 'cuda=cu:0', '-filter_hw_device', 'cu']
+            if overlay_filters:
+                filter_chains.append(f"[{overlay}]{','.join(overlay_filters)}[{label_prefix}overlay]")
+                overlay = f'{label_prefix}overlay'
+            # 静止画が先に終わっても最後のフレームを重ね続ける
+            filter_chains.append(f'[{video}][{overlay}]{overlay_filter}=eof_action=repeat:shortest=1:'
+                                 f'x={x_offset}:y={y_offset}[{label_prefix}out]')
+            video = f'{label_prefix}out'
+        
+        duration_params = {'t': duration} if duration else {}
+        thread_params = {'threads': self._resolve_threads(self.encoder_threads), 'thread_type': 'slice+frame'}
+        if use_cuda:
+            # GPU上のフレームをそのままNVENCでエンコードする（プロファイル指定時は上書き）
+            nvenc_params = {'preset': 'p4', **get_encoding_params(self.encoding_profile, 'h264_nvenc')}
+            output_options = {'vcodec': 'h264_nvenc',
+                              'r': DEFAULT_FPS,
+                              **nvenc_params,
+                              **thread_params,
+                              **duration_params}
+        else:
+            vcodec = self._output_codec()
+            codec_params = get_x265_params(thread_params['threads']) if vcodec == 'libx265' else {}
+            output_options = {'vcodec': vcodec,
+                              'pix_fmt': DEFAULT_PIXEL_FORMAT,
+                              'r': DEFAULT_FPS,
+                              **thread_params,
+                              **codec_params,
+                              **get_encoding_params(self.encoding_profile, vcodec),
+                              **duration_params}
+        
+        output_args = ['-map', f'[{video}]', *_output_option_args(output_options), output_path]
+        return global_args, input_args, ';'.join(filter_chains), output_args
+    
+    def _build_pipeline_args(self,
+                             sequence: list[VideoSegment | Transition],
+                             output_path: str,
+                             overlay_image: str | None = None,
+                             duration: float | None = None,
+                             prescale_dir: str | None = None) -> list[str]:
+        """連結（とオーバーレイ）を1回で行うFFmpegのコマンド引数を組み立てる"""
+        global_args, input_args, filter_graph, output_args = self._build_pipeline_output(
+            sequence, output_path, overlay_image, duration, prescale_dir)
+        
+        # 既存ファイルがあれば上書き
+        return ['ffmpeg', '-y', *global_args, *input_args, '-filter_complex', filter_graph, *output_args]
+    
+    def build_pipeline(self,
+                       sequence: list[VideoSegment | Transition],
+                       output_path: str,
+                       overlay_image: str | None = None,
+                       duration: float | None = None) -> list[str]:
+        """連結（とオーバーレイ）を1回で行うFFmpegのコマンドラインを生成する
+        
+        Args:
+            sequence: 動画セグメントとトランジションのリスト
+            output_path: 出力動画ファイルのパス
+            overlay_image: 連結結果に重ねる画像のパス（省略時は連結のみ）
+            duration: 出力動画の長さ（秒、省略時は連結結果の長さ）
+            
+        Returns:
+            list[str]: ffmpegコマンドの引数リスト
+        
+        Examples:
+            >>> processor = VideoProcessor()
+            >>> sequence = [VideoSegment("A.mp4"), Transition(TransitionMode.NONE), VideoSegment("B.mp4")]
+            >>> args = processor.build_pipeline(sequence, "output.mp4", overlay_image="title.png")
+        """
+        return self._build_pipeline_args(sequence, output_path, overlay_image, duration)
+    
+    def concatenate_and_mix(self,
+                            sequence: list[VideoSegment | Transition],
+                            overlay_image: str,
+                            output_path: str,
+                            duration: float | None = None,
+                            progress_callback: ProgressCallback | None = None) -> VideoInfo:
+        """動画を連結し、その上に画像をオーバーレイした動画を1回のFFmpeg実行で生成する
+        
+        concatenate_videos と mix_video_with_image を順に呼ぶ場合と異なり、
+        中間ファイルの書き出しと再エンコードが発生しない。
+        
+        Args:
+            sequence: 動画セグメントとトランジションのリスト
+            overlay_image: オーバーレイする画像のファイルパス
+            output_path: 出力動画ファイルのパス
+            duration: 出力動画の長さ（秒、省略時は連結結果の長さ）
+            progress_callback: エンコードの進捗の通知先（FFmpegの -progress の値を辞書で受け取る）
+            
+        Returns:
+            VideoInfo: 生成された動画の情報
+            
+        Raises:
+            VideoProcessingError: 処理が失敗した場合
+        
+        Examples:
+            >>> processor = VideoProcessor()
+            >>> sequence = processor.create_simple_sequence(["A.mp4", "B.mp4"])
+            >>> result = processor.concatenate_and_mix(sequence, "title.png", "output.mp4")
+        """
+        try:
+            # 縮小済みの画像はFFmpegの実行が終わるまで残す
+            with tempfile.TemporaryDirectory(prefix='movie_mix_overlay_') as prescale_dir:
+                run_ffmpeg_args(self._build_pipeline_args(sequence, output_path, overlay_image, duration, prescale_dir),
+                                quiet=False, progress_callback=progress_callback)
+            return self.get_video_info(output_path)
+        except Exception as e:
+            raise VideoProcessingError(f"動画の連結・ミックスに失敗しました: {e}")
     
     def create_crossfade_video(self,
                               video1_path: str,
@@ -525,7 +1223,7 @@ class VideoProcessor:
         
         Raises:
             ValueError: 動画ファイルが1つも指定されていない場合
-            FileNotFoundError: 指定された動画ファイルが存在しない場合
+            FileNotFoundError: 指定された動画ファイルが存在しない場合（見つからないものをすべて列挙する）
             
         Examples:
             >>> processor = VideoProcessor()
@@ -540,13 +1238,14 @@ class VideoProcessor:
         if len(video_paths) < 1:
             raise ValueError("少なくとも1つの動画ファイルが必要です")
         
+        # ファイル存在チェック（ディレクトリ単位でまとめて確認）
+        missing_paths = _find_missing_files(video_paths)
+        if missing_paths:
+            raise FileNotFoundError(f"動画ファイルが見つかりません: {', '.join(missing_paths)}")
+        
         sequence: list[VideoSegment | Transition] = []
         
         for i, video_path in enumerate(video_paths):
-            # ファイル存在チェック
-            if not Path(video_path).exists():
-                raise FileNotFoundError(f"動画ファイルが見つかりません: {video_path}")
-            
             sequence.append(VideoSegment(video_path))
             
             # 最後の動画でなければトランジション追加
@@ -704,7 +1403,9 @@ class VideoSequenceBuilder:
 def quick_concatenate(video_paths: list[str], 
                      output_path: str,
                      crossfade_duration: float = 1.0,
-                     crossfade_mode: TransitionMode = TransitionMode.CROSSFADE_INCREASE) -> VideoInfo:
+                     crossfade_mode: TransitionMode = TransitionMode.CROSSFADE_INCREASE,
+                     threads: int | None = None,
+                     encoding_profile: str | None = None) -> VideoInfo:
     """複数の動画を同じクロスフェイド設定で素早く連結する便利関数
     
     すべてのトランジションに同じクロスフェイド設定を適用して、
@@ -715,6 +1416,8 @@ def quick_concatenate(video_paths: list[str],
         output_path: 出力ファイルパス
         crossfade_duration: 各クロスフェイドの時間（秒）
         crossfade_mode: 各クロスフェイドのモード
+        threads: FFmpeg 1回の実行あたりのスレッド数（省略時はFFmpegの既定値）
+        encoding_profile: エンコードプロファイル名（"fast" で速度優先）
         
     Returns:
         VideoInfo: 生成された動画の情報
@@ -733,7 +1436,7 @@ def quick_concatenate(video_paths: list[str],
         ... )
         >>> print(f"Generated video: {result.duration}s")
     """
-    processor = VideoProcessor()
+    processor = VideoProcessor(threads=threads, encoding_profile=encoding_profile)
     
     # 全て同じ設定でシーケンス作成
     crossfade_durations = [crossfade_duration] * (len(video_paths) - 1)
@@ -746,10 +1449,59 @@ def quick_concatenate(video_paths: list[str],
     return processor.concatenate_videos(sequence, output_path)
 
 
+def quick_concat_and_mix(video_paths: list[str],
+                         overlay_image: str,
+                         output_path: str,
+                         crossfade_duration: float = 1.0,
+                         crossfade_mode: TransitionMode = TransitionMode.CROSSFADE_INCREASE,
+                         duration: float | None = None,
+                         threads: int | None = None,
+                         encoding_profile: str | None = None) -> VideoInfo:
+    """複数の動画を連結し、画像をオーバーレイした動画を1回のFFmpeg実行で生成する便利関数
+    
+    quick_concatenate と quick_mix を続けて呼ぶのと同じ結果を、中間ファイルを
+    作らずに生成する。
+    
+    Args:
+        video_paths: 動画ファイルパスのリスト
+        overlay_image: オーバーレイする画像のファイルパス
+        output_path: 出力ファイルパス
+        crossfade_duration: 各クロスフェイドの時間（秒）
+        crossfade_mode: 各クロスフェイドのモード
+        duration: 出力動画の長さ（秒、省略時は連結結果の長さ）
+        threads: FFmpeg 1回の実行あたりのスレッド数（省略時はFFmpegの既定値）
+        encoding_profile: エンコードプロファイル名（"fast" で速度優先）
+        
+    Returns:
+        VideoInfo: 生成された動画の情報
+    
+    Raises:
+        FileNotFoundError: 指定された動画ファイルが存在しない場合
+        VideoProcessingError: 処理が失敗した場合
+    
+    Examples:
+        >>> result = quick_concat_and_mix(["A.mp4", "B.mp4"], "title.png", "output.mp4")
+        >>> print(f"Generated video: {result.duration}s")
+    """
+    processor = VideoProcessor(threads=threads, encoding_profile=encoding_profile)
+    
+    # 全て同じ設定でシーケンス作成
+    crossfade_durations = [crossfade_duration] * (len(video_paths) - 1)
+    crossfade_modes = [crossfade_mode] * (len(video_paths) - 1)
+    
+    sequence = processor.create_simple_sequence(
+        video_paths, crossfade_durations, crossfade_modes
+    )
+    
+    return processor.concatenate_and_mix(sequence, overlay_image, output_path, duration)
+
+
 def quick_mix(background_video: str,
               overlay_image: str, 
               output_path: str,
-              duration: float = 30.0) -> VideoInfo:
+              duration: float = 30.0,
+              threads: int | None = None,
+              encoding_profile: str | None = None) -> VideoInfo:
     """動画と画像を素早くミックスする便利関数
     
     背景動画の上に画像をオーバーレイして、指定した長さの動画を生成する。
@@ -759,6 +1511,8 @@ def quick_mix(background_video: str,
         overlay_image: オーバーレイする画像のファイルパス
         output_path: 出力動画ファイルのパス
         duration: 動画の長さ（秒）
+        threads: FFmpeg 1回の実行あたりのスレッド数（省略時はFFmpegの既定値）
+        encoding_profile: エンコードプロファイル名（"fast" で速度優先）
         
     Returns:
         VideoInfo: 生成された動画の情報
@@ -771,7 +1525,7 @@ def quick_mix(background_video: str,
         >>> result = quick_mix("background.mp4", "overlay.png", "mixed.mp4", duration=60)
         >>> print(f"Mixed video duration: {result.duration}s")
     """
-    processor = VideoProcessor()
+    processor = VideoProcessor(threads=threads, encoding_profile=encoding_profile)
     return processor.mix_video_with_image(background_video, overlay_image, output_path, duration)
 
 
@@ -9,12 +9,33 @@ from pathlib import Path
 import ffmpeg
 
 
-@pytest.fixture
+# モック出力で書き込むダミーコンテンツ（全テストで共有）
+_DUMMY_VIDEO_CONTENT = b"dummy video content"
+
+# /dev/shm に出力する場合に必要な空き容量（これ未満ならディスク上の一時ディレクトリを使う）
+_MIN_SHM_FREE_BYTES = 2 * 1024 ** 3
+
+
+@pytest.fixture(scope="session")
 def samples_dir():
     """サンプルファイルディレクトリのパス"""
     return Path(__file__).parent.parent / "samples"
 
 
+@pytest.fixture(scope="session")
+def sample_videos(samples_dir) -> list[str]:
+    """サンプル動画ファイルのリスト（存在確認はセッションで1回のみ）"""
+    videos = [
+        str(samples_dir / '01_13523522_1920_1080_60fps.mp4'),
+        str(samples_dir / '02_ball_bokeh_02_slyblue.mp4'),
+        str(samples_dir / '03_intensive_line_02_color.mp4'),
+    ]
+    for v in videos:
+        if not os.path.exists(v):
+            pytest.skip(f"サンプル動画が見つかりません: {v}")
+    return videos
+
+
 @pytest.fixture
 def test_video_short(samples_dir):
     """短い動画ファイル（ball_bokeh_02_slyblue.mp4）"""
@@ -33,12 +54,37 @@ def test_image(samples_dir):
     return samples_dir / "02-1.png"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def video_processor():
+    """セッション全体で共有するVideoProcessor（速度優先のエンコード設定）"""
+    from movie_mix_util.video_processing_lib import VideoProcessor
+    return VideoProcessor(encoding_profile="fast")
+
+
+@pytest.fixture(scope="session")
+def shared_processor():
+    """セッション全体で共有する既定設定のVideoProcessor（単体テスト用）"""
+    from movie_mix_util.video_processing_lib import VideoProcessor
+    return VideoProcessor()
+
+
+@pytest.fixture(scope="session")
 def output_dir():
-    """テスト出力用ディレクトリ"""
-    output_path = Path(__file__).parent / "output"
-    output_path.mkdir(exist_ok=True)
-    return output_path
+    """テスト出力用ディレクトリ（セッション終了時に削除）
+    
+    /dev/shm（tmpfs）が利用可能で十分な空きがある場合はRAM上に作成し、
+    FFmpegの書き込みが遅いディスクで詰まらないようにする。
+    pytest-xdist で並列実行した場合はワーカーごとに別のディレクトリになる。
+    """
+    shm_dir = Path("/dev/shm")
+    use_shm = shm_dir.is_dir() and shutil.disk_usage(shm_dir).free > _MIN_SHM_FREE_BYTES
+    worker_id = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    output_path = Path(tempfile.mkdtemp(prefix=f"movie_mix_test_{worker_id}_",
+                                        dir=shm_dir if use_shm else None))
+    
+    yield output_path
+    
+    shutil.rmtree(output_path, ignore_errors=True)
 
 
 @pytest.fixture
@@ -67,9 +113,10 @@ def video_duration_checker():
         Returns:
             bool: 期待時間内かどうか
         """
+        from movie_mix_util.video_processing_lib import VideoInfo
         try:
-            probe = ffmpeg.probe(str(video_path))
-            actual_duration = float(probe['format']['duration'])
+            # 必要な項目だけを問い合わせる1回のffprobe（結果はキャッシュされる）
+            actual_duration = VideoInfo.from_path(str(video_path)).duration
             
             difference = abs(actual_duration - expected_duration)
             return difference <= tolerance, actual_duration
@@ -92,17 +139,18 @@ def video_properties_checker():
         Returns:
             dict: 動画のプロパティ情報
         """
+        from movie_mix_util.video_processing_lib import VideoInfo
         try:
-            probe = ffmpeg.probe(str(video_path))
-            video_stream = next(s for s in probe['streams'] if s['codec_type'] == 'video')
+            # 全プロパティを1回のffprobeで取得する（結果はキャッシュされる）
+            info = VideoInfo.from_path(str(video_path))
             
             return {
-                'duration': float(probe['format']['duration']),
-                'width': int(video_stream['width']),
-                'height': int(video_stream['height']),
-                'fps': eval(video_stream['r_frame_rate']) if 'r_frame_rate' in video_stream else None,
-                'codec': video_stream['codec_name'],
-                'pixel_format': video_stream.get('pix_fmt', 'unknown')
+                'duration': info.duration,
+                'width': info.width,
+                'height': info.height,
+                'fps': info.fps,
+                'codec': info.codec,
+                'pixel_format': info.pix_fmt or 'unknown'
             }
             
         except Exception as e:
@@ -153,33 +201,55 @@ def mock_ffmpeg_probe(monkeypatch, samples_dir):
                 ]
             }
 
+    def mock_entries(filename):
+        # VideoInfo が使う -show_entries の結果は mock_probe の内容から作る
+        probe = mock_probe(filename)
+        video_stream = next(s for s in probe["streams"] if s["codec_type"] == "video")
+        return {**{key: str(value) for key, value in video_stream.items()},
+                "duration": probe["format"]["duration"]}
+
+    # 実際のprobe結果とモックの結果が混ざらないよう、前後で動画情報キャッシュを破棄する
+    from movie_mix_util import video_processing_lib
+    video_processing_lib.VideoInfo.cache_clear()
     monkeypatch.setattr(ffmpeg, "probe", mock_probe)
+    monkeypatch.setattr(video_processing_lib, "_ffprobe_entries", mock_entries)
+    yield
+    video_processing_lib.VideoInfo.cache_clear()
 
 
 @pytest.fixture
 def mock_ffmpeg_run(monkeypatch):
-    """ffmpeg.runをモックし、実際のFFmpeg実行をスキップする"""
+    """ffmpeg.run と run_ffmpeg_args をモックし、実際のFFmpeg実行をスキップする"""
+    from ffmpeg._run import get_stream_spec_nodes
+    from ffmpeg.dag import topo_sort
+    
     def mock_run(stream_spec, cmd="ffmpeg", capture_stdout=False, capture_stderr=False, input=None, quiet=False, overwrite_output=False):
-        # output_pathが指定されていれば、ダミーのファイルを作成
-        output_path = None
-        if isinstance(stream_spec, ffmpeg.nodes.FilterNode):
-            # フィルターノードの場合、出力パスはstream_specには含まれない
-            # ここでは簡易的に、テストで使われるであろうoutput_pathを推測
-            # 実際のコードでは、outputノードからパスを取得する
-            pass
-        elif isinstance(stream_spec, ffmpeg.nodes.OutputNode):
-            output_path = stream_spec.args[-1] # 最後の引数が出力パスと仮定
-        
-        if output_path and not Path(output_path).parent.exists():
-            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-        if output_path:
-            with open(output_path, "w") as f:
-                f.write("dummy video content") # ダミーコンテンツ
+        # グラフ内のすべての出力ノード（merge_outputs で複数ある場合も含む）にダミーのファイルを作成
+        nodes, _ = topo_sort(get_stream_spec_nodes(stream_spec))
+        for node in nodes:
+            if isinstance(node, ffmpeg.nodes.OutputNode):
+                output_path = Path(node.kwargs['filename'])
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                output_path.write_bytes(_DUMMY_VIDEO_CONTENT)
         
         # 成功したかのように振る舞う
         return b"", b"" # stdout, stderr
 
+    def mock_run_args(args, quiet=False, progress_callback=None):
+        # 組み立て済みの引数で実行する場合は、各出力ファイルにダミーを作成
+        # （出力が複数ある場合、2つ目以降の -map の直前が前の出力のパスになる）
+        args = [arg for arg in args if arg != '-y']
+        map_indexes = [i for i, arg in enumerate(args) if arg == '-map']
+        for i in [*map_indexes[1:], len(args)]:
+            output_path = Path(args[i - 1])
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            output_path.write_bytes(_DUMMY_VIDEO_CONTENT)
+
+    from movie_mix_util import advanced_video_concatenator, common, video_processing_lib
     monkeypatch.setattr(ffmpeg, "run", mock_run)
+    monkeypatch.setattr(common, "run_ffmpeg_args", mock_run_args)
+    monkeypatch.setattr(video_processing_lib, "run_ffmpeg_args", mock_run_args)
+    monkeypatch.setattr(advanced_video_concatenator, "run_ffmpeg_args", mock_run_args)
 
 
 @pytest.fixture
@@ -203,6 +273,36 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "slow: 時間のかかるテスト")
     config.addinivalue_line("markers", "integration: 統合テスト")
     config.addinivalue_line("markers", "requires_ffmpeg: FFmpegが必要なテスト")
+    config.addinivalue_line("markers", "requires_nvenc: CUDA/NVENCが必要なテスト")
+
+
+def pytest_runtest_setup(item):
+    """CUDA/NVENCが利用できない環境では requires_nvenc のテストをスキップする"""
+    if item.get_closest_marker("requires_nvenc") is None:
+        return
+    
+    from movie_mix_util.common import is_nvenc_available
+    if not is_nvenc_available():
+        pytest.skip("CUDA/NVENC(h264_nvenc)が利用できません")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def limit_ffmpeg_threads():
+    """テストから起動されるFFmpegのスレッド数を制限する（セッション全体）
+    
+    pytest-xdist で並列実行した場合にワーカー数×FFmpegの既定スレッド数で
+    CPUが過剰割り当てにならないよう、MOVIE_MIX_FFMPEG_THREADS を
+    cpu_count // ワーカー数 に設定する。既に設定済みの場合はそれを尊重する。
+    """
+    if os.getenv("MOVIE_MIX_FFMPEG_THREADS"):
+        yield int(os.environ["MOVIE_MIX_FFMPEG_THREADS"])
+        return
+    
+    worker_count = int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", "1"))
+    threads = max(1, (os.cpu_count() or 4) // worker_count)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("MOVIE_MIX_FFMPEG_THREADS", str(threads))
+        yield threads
 
 
 @pytest.fixture(scope="session", autouse=True)
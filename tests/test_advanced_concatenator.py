@@ -6,7 +6,7 @@ from pathlib import Path
 from unittest.mock import patch
 
 # テスト対象のインポート
-from advanced_video_concatenator import (
+from movie_mix_util.advanced_video_concatenator import (
     TransitionMode,
     VideoSegment,
     Transition,
@@ -14,8 +14,11 @@ from advanced_video_concatenator import (
     calculate_sequence_duration,
     parse_crossfade_string,
     build_sequence_from_args,
-    concatenate_videos_advanced
+    build_concat_filter_complex,
+    concatenate_videos_advanced,
+    concatenate_videos_hybrid
 )
+from movie_mix_util.video_processing_lib import VideoInfo
 
 
 class TestDataClasses:
@@ -66,6 +69,26 @@ class TestVideoDuration:
         assert duration > 0
         print(f"13523522_1920_1080_60fps.mp4の長さ: {duration:.2f}秒")
     
+    def test_get_video_duration_cached(self, tmp_path, monkeypatch):
+        """同じ動画の長さを繰り返し取得してもffprobeが1回で済むかのテスト"""
+        import ffmpeg
+        probe_calls = []
+        
+        def counting_probe(filename):
+            probe_calls.append(filename)
+            return {"format": {"duration": "5.0"}, "streams": [{"codec_type": "video", "duration": "5.0"}]}
+        
+        monkeypatch.setattr(ffmpeg, "probe", counting_probe)
+        VideoInfo.cache_clear()
+        video = tmp_path / "cached.mp4"
+        video.write_bytes(b"dummy video content")
+        
+        assert get_video_duration(str(video)) == 5.0
+        assert get_video_duration(str(video)) == 5.0
+        assert len(probe_calls) == 1
+        
+        VideoInfo.cache_clear()
+    
     def test_get_video_duration_nonexistent(self):
         """存在しない動画でのエラーテスト"""
         with pytest.raises(SystemExit):
@@ -83,7 +106,7 @@ class TestSequenceDurationCalculation:
             VideoSegment("video2.mp4")   # 15秒想定
         ]
         
-        with patch('advanced_video_concatenator.get_video_duration') as mock_duration:
+        with patch('movie_mix_util.advanced_video_concatenator.get_video_duration') as mock_duration:
             mock_duration.side_effect = [10.0, 15.0]  # 順番に返す
             
             total = calculate_sequence_duration(sequence)
@@ -97,7 +120,7 @@ class TestSequenceDurationCalculation:
             VideoSegment("video2.mp4")   # 15秒想定
         ]
         
-        with patch('advanced_video_concatenator.get_video_duration') as mock_duration:
+        with patch('movie_mix_util.advanced_video_concatenator.get_video_duration') as mock_duration:
             mock_duration.side_effect = [10.0, 15.0]
             
             total = calculate_sequence_duration(sequence)
@@ -111,7 +134,7 @@ class TestSequenceDurationCalculation:
             VideoSegment("video2.mp4")   # 15秒想定
         ]
         
-        with patch('advanced_video_concatenator.get_video_duration') as mock_duration:
+        with patch('movie_mix_util.advanced_video_concatenator.get_video_duration') as mock_duration:
             mock_duration.side_effect = [10.0, 15.0]
             
             total = calculate_sequence_duration(sequence)
@@ -128,13 +151,81 @@ class TestSequenceDurationCalculation:
             VideoSegment("C.mp4")   # 15秒
         ]
         
-        with patch('advanced_video_concatenator.get_video_duration') as mock_duration:
+        with patch('movie_mix_util.advanced_video_concatenator.get_video_duration') as mock_duration:
             mock_duration.side_effect = [15.0, 15.0, 15.0]
             
             total = calculate_sequence_duration(sequence)
             expected = 15.0 + 15.0 + 15.0 - 1.0 + 1.0  # 46.0
             assert total == expected
             print(f"混合モード計算結果: {total}秒（期待値: {expected}秒）")
+    
+    def test_calculate_sequence_duration_repeated_video(self):
+        """同じ動画を繰り返し使う場合に長さの取得が1回で済むかのテスト"""
+        sequence = []
+        for _ in range(1000):
+            sequence += [VideoSegment("loop.mp4"), Transition(TransitionMode.CROSSFADE_NO_INCREASE, 1.0)]
+        sequence.append(VideoSegment("loop.mp4"))
+        
+        with patch('movie_mix_util.advanced_video_concatenator.get_video_duration', return_value=5.0) as mock_duration:
+            total = calculate_sequence_duration(sequence)
+        
+        assert mock_duration.call_count == 1
+        assert total == 1001 * 5.0 - 1000 * 1.0
+
+
+class TestConcatStreamBuilding:
+    """連結フィルターグラフ構築のテスト"""
+    
+    def test_build_concat_filter_complex_opens_each_segment_once(self):
+        """クロスフェイド用のフレームを入力を開き直さずに切り出すかのテスト"""
+        sequence = [
+            VideoSegment("A.mp4"),
+            Transition(TransitionMode.CROSSFADE_NO_INCREASE, 1.0),
+            VideoSegment("B.mp4"),
+            Transition(TransitionMode.CROSSFADE_INCREASE, 1.0),
+            VideoSegment("A.mp4"),
+            Transition(TransitionMode.NONE),
+            VideoSegment("C.mp4")
+        ]
+        
+        with patch('movie_mix_util.advanced_video_concatenator.get_video_duration', return_value=5.0):
+            input_args, filter_complex, label = build_concat_filter_complex(sequence, decoder_threads=2)
+        
+        input_files = [input_args[i + 1] for i, arg in enumerate(input_args) if arg == "-i"]
+        assert input_files == ["A.mp4", "B.mp4", "C.mp4"]
+        assert input_args[input_args.index("-threads") + 1] == "2"
+        assert "-ss" not in input_args
+        assert "trim=duration=4.0" in filter_complex
+        assert filter_complex.endswith(f"concat=a=0:n=6:unsafe=1:v=1[{label}]")
+    
+    def test_build_concat_filter_complex_shares_inputs(self):
+        """複数のシーケンスをまとめる場合に入力を共有し、ラベルが衝突しないかのテスト"""
+        input_indexes = {}
+        first = [VideoSegment("A.mp4"), Transition(TransitionMode.CROSSFADE_INCREASE, 1.0), VideoSegment("B.mp4")]
+        second = [VideoSegment("B.mp4"), Transition(TransitionMode.CROSSFADE_INCREASE, 1.0), VideoSegment("C.mp4")]
+        
+        with patch('movie_mix_util.advanced_video_concatenator.get_video_duration', return_value=5.0):
+            first_inputs, first_graph, first_label = build_concat_filter_complex(
+                first, input_indexes=input_indexes, label_prefix="o0_")
+            second_inputs, second_graph, second_label = build_concat_filter_complex(
+                second, input_indexes=input_indexes, label_prefix="o1_")
+        
+        assert first_inputs == ["-i", "A.mp4", "-i", "B.mp4"]
+        assert second_inputs == ["-i", "C.mp4"]
+        assert input_indexes == {"A.mp4": 0, "B.mp4": 1, "C.mp4": 2}
+        assert second_graph.startswith("[1:v]")
+        assert (first_label, second_label) == ("o0_concat", "o1_concat")
+        assert "[o1_xf1]" in second_graph and "[o0_xf1]" not in second_graph
+    
+    @pytest.mark.parametrize("sequence", [
+        [Transition(TransitionMode.CROSSFADE_INCREASE, 1.0), VideoSegment("A.mp4")],
+        [VideoSegment("A.mp4"), Transition(TransitionMode.CROSSFADE_INCREASE, 1.0)],
+        [VideoSegment("A.mp4"), VideoSegment("B.mp4")],
+    ])
+    def test_concatenate_videos_hybrid_rejects_unpaired_transition(self, sequence):
+        """前後に動画セグメントがないトランジションを含むシーケンスを拒否するかのテスト"""
+        with pytest.raises(ValueError):
+            concatenate_videos_hybrid(sequence, "output.mp4", 1920, 1080, 30.0, "yuv420p")
 
 
 class TestCrossfadeParsing:
@@ -398,7 +489,7 @@ class TestTimeCalculationAccuracy:
             VideoSegment("C.mp4")
         ]
         
-        with patch('advanced_video_concatenator.get_video_duration') as mock_duration:
+        with patch('movie_mix_util.advanced_video_concatenator.get_video_duration') as mock_duration:
             mock_duration.side_effect = [15.0, 15.0, 15.0]
             
             total_duration = calculate_sequence_duration(sequence)
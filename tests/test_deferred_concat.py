@@ -5,18 +5,15 @@ DeferredVideoSequence の単体テスト
 
 import pytest
 import os
-import sys
 from pathlib import Path
 
 # テスト対象のモジュールをインポート
-# プロジェクトルートをパスに追加
+# （srcディレクトリは pyproject.toml の pythonpath 設定で解決される）
+from movie_mix_util.deferred_concat import movie, DeferredVideoSequence
+from movie_mix_util.advanced_video_concatenator import CrossfadeEffect, TransitionMode
+
 current_dir = Path(__file__).parent
 project_root = current_dir.parent
-sys.path.insert(0, str(project_root))
-
-from deferred_concat import movie, DeferredVideoSequence
-from advanced_video_concatenator import CrossfadeEffect
-
 
 SAMPLES_DIR = project_root / 'samples'
 OUTPUT_DIR = current_dir / 'output'
@@ -28,20 +25,6 @@ def setup_output_directory():
     OUTPUT_DIR.mkdir(exist_ok=True)
 
 
-@pytest.fixture
-def sample_videos() -> list[str]:
-    """サンプル動画ファイルのリストを提供するフィクスチャ"""
-    videos = [
-        str(SAMPLES_DIR / '01_13523522_1920_1080_60fps.mp4'),
-        str(SAMPLES_DIR / '02_ball_bokeh_02_slyblue.mp4'),
-        str(SAMPLES_DIR / '03_intensive_line_02_color.mp4'),
-    ]
-    for v in videos:
-        if not os.path.exists(v):
-            pytest.skip(f"サンプル動画が見つかりません: {v}")
-    return videos
-
-
 def test_two_videos_concatenation(sample_videos, mock_ffmpeg_probe, mock_ffmpeg_run):
     """2つの動画を正常に連結できるかテスト"""
     video1, video2 = sample_videos[:2]
@@ -110,7 +93,7 @@ def test_increase_mode_concatenation(sample_videos, mock_ffmpeg_probe, mock_ffmp
     transition_duration = 1.5
 
     # 期待される長さを計算
-    from deferred_concat import get_video_duration
+    from movie_mix_util.deferred_concat import get_video_duration
     duration1 = get_video_duration(video1)
     duration2 = get_video_duration(video2)
     expected_duration = duration1 + transition_duration + duration2
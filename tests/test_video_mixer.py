@@ -6,7 +6,8 @@ from pathlib import Path
 import tempfile
 
 # テスト対象のインポート - 新しいAPIを使用
-from video_processing_lib import VideoProcessor, quick_mix
+from movie_mix_util.video_processing_lib import VideoProcessor, MixSpec, quick_mix, scale_to_fit_batch, center_offsets_batch, is_opaque_image, prescale_image
+from movie_mix_util.video_processing_lib import get_image_dimensions as _get_image_dimensions
 
 # 後方互換性のためのラッパー
 def mix_video_with_image(background_video: str, overlay_image: str, output_video: str, duration: int = 30):
@@ -14,36 +15,22 @@ def mix_video_with_image(background_video: str, overlay_image: str, output_video
     return quick_mix(background_video, overlay_image, output_video, duration)
 
 # 内部ヘルパー関数は統合されたため、テストではモック/スタブを使用
-from PIL import Image
-import os
-
 def get_image_dimensions(image_path: str) -> tuple[int, int]:
     """画像サイズを取得（テスト用ヘルパー）"""
-    with Image.open(image_path) as img:
-        return img.size
+    return _get_image_dimensions(image_path)
 
 def calculate_scale_to_fit(image_width: int, image_height: int, 
                           target_width: int = 1920, target_height: int = 1080) -> tuple[int, int]:
     """画面内に収まるようにスケーリング計算（テスト用ヘルパー）"""
-    aspect_ratio = image_width / image_height
-    target_aspect = target_width / target_height
-    
-    if aspect_ratio > target_aspect:
-        new_width = target_width
-        new_height = int(target_width / aspect_ratio)
-    else:
-        new_height = target_height
-        new_width = int(target_height * aspect_ratio)
-    
-    return new_width, new_height
+    [scaled] = scale_to_fit_batch([(image_width, image_height)], target_width, target_height)
+    return scaled
 
 def calculate_position_for_centering(scaled_width: int, scaled_height: int, 
                                    target_width: int = 1920, 
                                    target_height: int = 1080) -> tuple[int, int]:
     """中央配置のオフセットを計算（テスト用ヘルパー）"""
-    x_offset = (target_width - scaled_width) // 2
-    y_offset = (target_height - scaled_height) // 2
-    return x_offset, y_offset
+    [offsets] = center_offsets_batch([(scaled_width, scaled_height)], target_width, target_height)
+    return offsets
 
 
 class TestImageDimensions:
@@ -71,6 +58,51 @@ class TestImageDimensions:
         assert height > 0
         print(f"title-base.png サイズ: {width}x{height}")
     
+    @pytest.mark.parametrize("suffix", [".png", ".jpg"])
+    def test_get_image_dimensions_matches_pil(self, tmp_path, suffix):
+        """PNG・JPEGのサイズをPILを使わずヘッダーから読み取り、PILと一致するかのテスト"""
+        from unittest.mock import patch
+        from PIL import Image
+        image_path = str(tmp_path / f"overlay{suffix}")
+        Image.new("RGB", (1016, 908)).save(image_path)
+        with Image.open(image_path) as img:
+            expected = img.size
+        
+        # ヘッダーを直接解析する形式ではPILで画像を開かない
+        with patch("PIL.Image.open", side_effect=AssertionError("PIL.Image.open が呼ばれました")):
+            assert get_image_dimensions(image_path) == expected
+    
+    @pytest.mark.parametrize("progressive", [False, True])
+    def test_get_image_dimensions_jpeg_header(self, tmp_path, progressive):
+        """JPEGのサイズをSOFセグメントから読み取れるかのテスト"""
+        from PIL import Image
+        image_path = tmp_path / "overlay.jpg"
+        Image.new("RGB", (1016, 908)).save(image_path, progressive=progressive)
+        
+        assert get_image_dimensions(str(image_path)) == (1016, 908)
+        
+        # ファイルが更新されたらキャッシュではなく新しいサイズを返す
+        Image.new("RGB", (640, 480)).save(image_path, progressive=progressive)
+        assert get_image_dimensions(str(image_path)) == (640, 480)
+    
+    def test_prescale_image(self, tmp_path):
+        """画像が1回だけ縮小され、透過が保たれたPNGとして書き出されるかのテスト"""
+        from PIL import Image
+        image_path = tmp_path / "overlay.png"
+        palette_image = Image.new("P", (2048, 2048))
+        palette_image.info["transparency"] = 0
+        palette_image.save(image_path, transparency=0)
+        
+        scaled_path = prescale_image(str(image_path), (1080, 1080), str(tmp_path))
+        assert scaled_path != str(image_path)
+        with Image.open(scaled_path) as scaled:
+            assert scaled.format == "PNG"
+            assert scaled.size == (1080, 1080)
+            assert scaled.mode == "RGBA"
+        
+        # 縮小不要なサイズなら元の画像をそのまま使う
+        assert prescale_image(str(image_path), (2048, 2048), str(tmp_path)) == str(image_path)
+    
     def test_get_image_dimensions_nonexistent_file(self):
         """存在しないファイルでのエラーテスト"""
         with pytest.raises(Exception):
@@ -125,6 +157,24 @@ class TestScaleCalculation:
         # 幅基準で拡大される
         assert scaled_width == 1920
         assert scaled_height == 1152  # 300 * (1920/500) = 1152
+    
+    def test_scale_to_fit_batch_matches_scalar(self):
+        """一括計算が1件ずつの計算と一致するかのテスト"""
+        import random
+        rng = random.Random(0)
+        dims = [(rng.randint(1, 8000), rng.randint(1, 8000)) for _ in range(1000)]
+        
+        expected = []
+        for w, h in dims:
+            if w / h > 1920 / 1080:
+                expected.append((1920, int(1920 / (w / h))))
+            else:
+                expected.append((int(1080 * (w / h)), 1080))
+        
+        assert scale_to_fit_batch(dims, 1920, 1080) == expected
+        assert center_offsets_batch(expected, 1920, 1080) == [
+            ((1920 - w) // 2, (1080 - h) // 2) for w, h in expected
+        ]
 
 
 class TestPositionCalculation:
@@ -166,11 +216,11 @@ class TestVideoMixer:
         duration = 5  # 5秒の動画を作成
         
         # 実行
-        mix_video_with_image(background_video, overlay_image, output_video, duration)
+        result_info = mix_video_with_image(background_video, overlay_image, output_video, duration)
         
-        # 出力ファイルが作成されたか確認
-        assert temp_output_file.exists()
-        assert temp_output_file.stat().st_size > 0
+        # 出力ファイルが作成されたか確認（戻り値のサイズは出力ファイルから取得される）
+        assert result_info.path == output_video
+        assert result_info.size_mb > 0
         
         # 動画長の確認
         is_correct_duration, actual_duration = video_duration_checker(temp_output_file, duration)
@@ -189,10 +239,10 @@ class TestVideoMixer:
         duration = 10
         
         # 実行
-        mix_video_with_image(background_video, overlay_image, output_video, duration)
+        result_info = mix_video_with_image(background_video, overlay_image, output_video, duration)
         
         # 検証
-        assert temp_output_file.exists()
+        assert result_info.path == output_video
         is_correct_duration, actual_duration = video_duration_checker(temp_output_file, duration)
         assert is_correct_duration, f"期待時間: {duration}s, 実際: {actual_duration:.2f}s"
         
@@ -223,6 +273,79 @@ class TestVideoMixer:
         
         print(f"✅ 出力プロパティ: {properties}")
     
+    @pytest.mark.slow
+    @pytest.mark.requires_ffmpeg
+    @pytest.mark.requires_nvenc
+    def test_mix_video_with_image_cuda(self, test_video_short, samples_dir, temp_output_file,
+                                       video_duration_checker):
+        """CUDA/NVENCでの動画・画像ミックステスト"""
+        processor = VideoProcessor(hw_accel="cuda")
+        duration = 5
+        
+        result_info = processor.mix_video_with_image(
+            str(test_video_short), str(samples_dir / "02-1.png"), str(temp_output_file), duration
+        )
+        
+        assert result_info.size_mb > 0
+        is_correct_duration, actual_duration = video_duration_checker(temp_output_file, duration)
+        assert is_correct_duration, f"期待時間: {duration}s, 実際: {actual_duration:.2f}s"
+    
+    def test_mix_video_with_image_batch_single_invocation(self, samples_dir, tmp_path, monkeypatch):
+        """複数のミックスが1回のFFmpeg実行にまとめられるかのテスト"""
+        import ffmpeg
+        invocations = []
+        
+        def capture_run(stream_spec, **kwargs):
+            invocations.append(ffmpeg.get_args(stream_spec))
+            for spec in specs:
+                Path(spec.output_path).write_bytes(b"dummy video content")
+        
+        monkeypatch.setattr(ffmpeg, "run", capture_run)
+        specs = [
+            MixSpec(str(samples_dir / "02_ball_bokeh_02_slyblue.mp4"), str(samples_dir / "02-1.png"),
+                    str(tmp_path / "out1.mp4"), 5),
+            MixSpec(str(samples_dir / "01_13523522_1920_1080_60fps.mp4"), str(samples_dir / "title-base.png"),
+                    str(tmp_path / "out2.mp4"), 8),
+        ]
+        
+        result_infos = VideoProcessor(hw_accel="cpu").mix_video_with_image_batch(specs)
+        
+        assert len(invocations) == 1
+        args = invocations[0]
+        assert args.count("-i") == 4
+        assert args.count("-map") == 2
+        assert [info.path for info in result_infos] == [spec.output_path for spec in specs]
+        assert [info.duration for info in result_infos] == [5.0, 8.0]
+    
+    @pytest.mark.parametrize("mode,expect_background", [("RGB", False), ("RGBA", True)])
+    def test_mix_skips_fully_covered_background(self, samples_dir, tmp_path, monkeypatch, mode, expect_background):
+        """不透明な画像が画面全体を覆う場合は背景動画を入力しないかのテスト"""
+        import ffmpeg
+        from PIL import Image
+        overlay_image = str(tmp_path / "cover.png")
+        Image.new(mode, (1920, 1080)).save(overlay_image)
+        assert is_opaque_image(overlay_image) is not expect_background
+        
+        background_video = str(samples_dir / "02_ball_bokeh_02_slyblue.mp4")
+        output_path = str(tmp_path / "output.mp4")
+        invocations = []
+        
+        def capture_run(stream_spec, **kwargs):
+            invocations.append(ffmpeg.get_args(stream_spec))
+            Path(output_path).write_bytes(b"dummy video content")
+        
+        monkeypatch.setattr(ffmpeg, "run", capture_run)
+        VideoProcessor(hw_accel="cpu").mix_video_with_image(background_video, overlay_image, output_path, 5)
+        
+        [args] = invocations
+        assert (background_video in args) is expect_background
+        assert args.count("-i") == (2 if expect_background else 1)
+    
+    def test_video_processor_invalid_hw_accel(self):
+        """不正なhw_accel指定のテスト"""
+        with pytest.raises(ValueError):
+            VideoProcessor(hw_accel="gpu")
+    
     def test_mix_video_with_image_nonexistent_video(self, samples_dir, temp_output_file):
         """存在しない動画ファイルでのエラーテスト"""
         background_video = "nonexistent_video.mp4"
@@ -289,24 +412,31 @@ class TestRealVideoMixing:
             }
         ]
         
+        specs = [
+            MixSpec(
+                background_video=str(samples_dir / case['video']),
+                overlay_image=str(samples_dir / case['image']),
+                output_path=str(output_dir / f"test_{case['name']}.mp4"),
+                duration=case['duration']
+            )
+            for case in test_cases
+        ]
+        
+        # 既存ファイルがあれば削除
+        for spec in specs:
+            Path(spec.output_path).unlink(missing_ok=True)
+        
+        # 全ケースを1回のFFmpeg実行でミックス
+        result_infos = VideoProcessor().mix_video_with_image_batch(specs)
+        
         results = []
         
-        for case in test_cases:
+        for case, spec, result_info in zip(test_cases, specs, result_infos):
             print(f"\n=== {case['name']} ===")
-            
-            background_video = str(samples_dir / case['video'])
-            overlay_image = str(samples_dir / case['image'])
-            output_video = str(output_dir / f"test_{case['name']}.mp4")
-            
-            # 既存ファイルがあれば削除
-            if Path(output_video).exists():
-                Path(output_video).unlink()
-            
-            # ミックス実行
-            mix_video_with_image(background_video, overlay_image, output_video, case['duration'])
+            output_video = spec.output_path
             
             # 検証
-            assert Path(output_video).exists()
+            assert result_info.path == output_video
             properties = video_properties_checker(Path(output_video))
             
             # 結果記録
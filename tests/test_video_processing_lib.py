@@ -2,10 +2,11 @@
 
 import pytest
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch, Mock
 
 # テスト対象のインポート
-from video_processing_lib import (
+from movie_mix_util.video_processing_lib import (
     VideoInfo,
     VideoProcessor,
     VideoSequenceBuilder,
@@ -13,7 +14,13 @@ from video_processing_lib import (
     quick_concatenate,
     quick_mix
 )
-from advanced_video_concatenator import TransitionMode, VideoSegment, Transition
+from movie_mix_util.common import (
+    get_encoding_params,
+    get_x265_params,
+    run_ffmpeg_args,
+    spill_filter_complex_script
+)
+from movie_mix_util.advanced_video_concatenator import TransitionMode, VideoSegment, Transition
 
 
 class TestVideoInfo:
@@ -50,6 +57,66 @@ class TestVideoInfo:
         with pytest.raises(VideoProcessingError):
             VideoInfo.from_path("nonexistent_video.mp4")
     
+    def test_video_info_from_path_cached(self, tmp_path):
+        """同じファイルへの繰り返し取得でprobeが再実行されないかのテスト"""
+        probe_calls = []
+        
+        def counting_entries(filename):
+            probe_calls.append(filename)
+            return {"width": "1280", "height": "720", "r_frame_rate": "30/1", "duration": "5.0"}
+        
+        VideoInfo.cache_clear()
+        video = tmp_path / "cached.mp4"
+        video.write_bytes(b"dummy video content")
+        
+        with patch('movie_mix_util.video_processing_lib._ffprobe_entries', side_effect=counting_entries):
+            first = VideoInfo.from_path(str(video))
+            second = VideoInfo.from_path(str(video))
+            assert first == second
+            assert len(probe_calls) == 1
+            
+            # ファイルが更新されたら再取得する
+            video.write_bytes(b"updated dummy video content")
+            VideoInfo.from_path(str(video))
+            assert len(probe_calls) == 2
+        
+        VideoInfo.cache_clear()
+    
+    def test_video_info_from_path_projected_entries(self, tmp_path):
+        """ffprobeに必要な項目だけを問い合わせ、key=value 出力を解析するかのテスト"""
+        import subprocess
+        stdout = ("codec_name=h264\nwidth=1920\nheight=1080\npix_fmt=yuv420p\n"
+                  "r_frame_rate=30000/1001\nduration=5.005000\n")
+        video = tmp_path / "projected.mp4"
+        video.write_bytes(b"dummy video content")
+        VideoInfo.cache_clear()
+        
+        with patch('subprocess.run', return_value=subprocess.CompletedProcess([], 0, stdout, "")) as mock_run:
+            info = VideoInfo.from_path(str(video))
+        
+        command = mock_run.call_args.args[0]
+        assert "-show_entries" in command
+        assert "-show_streams" not in command
+        assert (info.width, info.height, info.codec, info.pix_fmt) == (1920, 1080, "h264", "yuv420p")
+        assert info.duration == 5.005
+        assert abs(info.fps - 29.97) < 0.01
+        
+        VideoInfo.cache_clear()
+    
+    @pytest.mark.parametrize("frame_rate,expected_fps", [("30/1", 30.0), ("30000/1001", 30000 / 1001),
+                                                         ("0/0", None), ("25", 25.0)])
+    def test_video_info_frame_rate_parsing(self, tmp_path, frame_rate, expected_fps):
+        """r_frame_rate が eval を使わずに解析されるかのテスト"""
+        video = tmp_path / "rate.mp4"
+        video.write_bytes(b"dummy video content")
+        VideoInfo.cache_clear()
+        
+        with patch('movie_mix_util.video_processing_lib._ffprobe_entries',
+                   return_value={"width": "1920", "height": "1080", "r_frame_rate": frame_rate, "duration": "5.0"}):
+            assert VideoInfo.from_path(str(video)).fps == expected_fps
+        
+        VideoInfo.cache_clear()
+    
     def test_video_info_manual_creation(self):
         """手動でのVideoInfo作成テスト"""
         info = VideoInfo(
@@ -90,18 +157,276 @@ class TestVideoProcessor:
         assert processor.default_height == 2160
         assert processor.default_fps == 60
     
+    def test_mix_video_with_image_thread_args(self, samples_dir, tmp_path, monkeypatch):
+        """デコード・エンコードのスレッド数がFFmpegの引数に反映されるかのテスト"""
+        import ffmpeg
+        captured_args = []
+        
+        def capture_run(stream_spec, **kwargs):
+            captured_args.extend(ffmpeg.get_args(stream_spec))
+            Path(output_path).write_bytes(b"dummy video content")
+        
+        monkeypatch.setattr(ffmpeg, "run", capture_run)
+        output_path = str(tmp_path / "output.mp4")
+        processor = VideoProcessor(hw_accel="cpu", decoder_threads=2, encoder_threads=3)
+        processor.mix_video_with_image(
+            str(samples_dir / "02_ball_bokeh_02_slyblue.mp4"), str(samples_dir / "02-1.png"), output_path, 5
+        )
+        
+        # 各入力の直前にデコード用、出力側にエンコード用の -threads が付く
+        first_input = captured_args.index("-i")
+        assert captured_args[:first_input].count("-threads") == 1
+        assert captured_args[captured_args.index("-threads") + 1] == "2"
+        assert captured_args.count("-threads") == 3
+        output_threads = len(captured_args) - 1 - captured_args[::-1].index("-threads")
+        assert captured_args[output_threads + 1] == "3"
+        assert "-thread_type" in captured_args
+        # 静止画は1fpsで入力し、overlay が背景の各フレームに使い回す
+        assert captured_args[captured_args.index("-framerate") + 1] == "1"
+        assert "scale=" not in captured_args[captured_args.index("-filter_complex") + 1]
+    
+    def test_mix_video_with_image_hevc_fast(self, samples_dir, tmp_path, monkeypatch):
+        """hevc_fast 指定時に libx265 がエンコードのスレッド数で並列化されるかのテスト"""
+        import ffmpeg
+        captured_args = []
+        
+        def capture_run(stream_spec, **kwargs):
+            captured_args.extend(ffmpeg.get_args(stream_spec))
+            Path(output_path).write_bytes(b"dummy video content")
+        
+        monkeypatch.setattr(ffmpeg, "run", capture_run)
+        output_path = str(tmp_path / "output.mp4")
+        processor = VideoProcessor(hw_accel="cuda", encoder_threads=4, hevc_fast=True)
+        processor.mix_video_with_image(
+            str(samples_dir / "02_ball_bokeh_02_slyblue.mp4"), str(samples_dir / "02-1.png"), output_path, 5
+        )
+        
+        # HEVC指定はハードウェア指定より優先され、ソフトウェアの libx265 でエンコードする
+        assert captured_args[captured_args.index("-vcodec") + 1] == "libx265"
+        assert captured_args[captured_args.index("-x265-params") + 1] == "wpp=1:frame-threads=4:pools=4"
+        assert captured_args[captured_args.index("-preset") + 1] == "faster"
+        assert "overlay_cuda" not in captured_args[captured_args.index("-filter_complex") + 1]
+    
+    @pytest.mark.parametrize("second_entries,expect_stream_copy", [
+        ({}, True),
+        ({"codec_name": "hevc"}, False),
+        # 形式が同じでも、プロファイル・レベル・SPS/PPS・タイムベースが違えば再エンコードする
+        ({"profile": "Main"}, False),
+        ({"level": "51"}, False),
+        ({"extradata_hash": "SHA256:bbbb"}, False),
+        ({"time_base": "1/90000"}, False),
+    ])
+    def test_concatenate_videos_stream_copy(self, tmp_path, monkeypatch, second_entries, expect_stream_copy):
+        """同一形式の動画を単純結合する場合のみ再エンコードなしで連結されるかのテスト"""
+        from movie_mix_util import advanced_video_concatenator
+        
+        def mock_entries(filename):
+            entries = {"codec_name": "h264", "width": "1920", "height": "1080",
+                       "r_frame_rate": "30/1", "pix_fmt": "yuv420p", "duration": "5.0",
+                       "profile": "High", "level": "42", "time_base": "1/15360",
+                       "extradata_hash": "SHA256:aaaa"}
+            return {**entries, **second_entries} if Path(filename).name == "B.mp4" else entries
+        
+        captured_args = []
+        captured_callbacks = []
+        
+        def capture_run_args(args, **kwargs):
+            captured_args.extend(args)
+            captured_callbacks.append(kwargs.get("progress_callback"))
+            (tmp_path / "output.mp4").write_bytes(b"dummy video content")
+        
+        def progress_callback(progress):
+            pass
+        
+        monkeypatch.setattr(advanced_video_concatenator, "run_ffmpeg_args", capture_run_args)
+        VideoInfo.cache_clear()
+        for name in ("A.mp4", "B.mp4"):
+            (tmp_path / name).write_bytes(b"dummy video content")
+        
+        sequence = (VideoSequenceBuilder()
+                    .add_video(str(tmp_path / "A.mp4"))
+                    .add_simple_transition()
+                    .add_video(str(tmp_path / "B.mp4"))
+                    .build())
+        
+        with patch('movie_mix_util.video_processing_lib._ffprobe_entries', side_effect=mock_entries), \
+             patch('movie_mix_util.video_processing_lib.concatenate_videos_advanced',
+                   side_effect=lambda *args, **kwargs: (tmp_path / "output.mp4").write_bytes(b"dummy video content")
+                   ) as mock_advanced:
+            VideoProcessor().concatenate_videos(sequence, str(tmp_path / "output.mp4"),
+                                                progress_callback=progress_callback)
+        
+        if expect_stream_copy:
+            assert captured_args[captured_args.index("-f") + 1] == "concat"
+            assert captured_args[captured_args.index("-c") + 1] == "copy"
+            assert captured_callbacks == [progress_callback]
+            mock_advanced.assert_not_called()
+        else:
+            assert captured_args == []
+            mock_advanced.assert_called_once()
+        
+        VideoInfo.cache_clear()
+    
+    @pytest.mark.parametrize("mode,profile,expect_hybrid", [
+        (TransitionMode.CROSSFADE_INCREASE, "High", True),
+        # libx264で同じプロファイルを出力できない場合は全体をエンコードする
+        (TransitionMode.CROSSFADE_INCREASE, "High 4:4:4 Predictive", False),
+        (TransitionMode.CROSSFADE_NO_INCREASE, "High", False),
+    ])
+    def test_concatenate_videos_hybrid(self, tmp_path, monkeypatch, mode, profile, expect_hybrid):
+        """クロスフェイド(増加あり)では動画本体をストリームコピーし、フェイド区間だけエンコードするかのテスト"""
+        from movie_mix_util import advanced_video_concatenator
+        
+        def mock_entries(filename):
+            return {"codec_name": "h264", "width": "1920", "height": "1080",
+                    "r_frame_rate": "30000/1001", "pix_fmt": "yuv420p", "duration": "5.0",
+                    "profile": profile, "level": "40", "time_base": "1/30000", "extradata_hash": "SHA256:aaaa"}
+        
+        captured_args = []
+        captured_callbacks = []
+        
+        def capture_run_args(args, **kwargs):
+            captured_args.append(args)
+            captured_callbacks.append(kwargs.get("progress_callback"))
+            Path(args[-1]).write_bytes(b"dummy video content")
+        
+        def progress_callback(progress):
+            pass
+        
+        monkeypatch.setattr(advanced_video_concatenator, "run_ffmpeg_args", capture_run_args)
+        VideoInfo.cache_clear()
+        for name in ("A.mp4", "B.mp4"):
+            (tmp_path / name).write_bytes(b"dummy video content")
+        
+        sequence = (VideoSequenceBuilder()
+                    .add_video(str(tmp_path / "A.mp4"))
+                    .add_crossfade(1.0, mode)
+                    .add_video(str(tmp_path / "B.mp4"))
+                    .build())
+        
+        with patch('movie_mix_util.video_processing_lib._ffprobe_entries', side_effect=mock_entries), \
+             patch('movie_mix_util.advanced_video_concatenator.get_video_duration', return_value=5.0), \
+             patch('movie_mix_util.video_processing_lib.concatenate_videos_advanced',
+                   side_effect=lambda *args, **kwargs: (tmp_path / "output.mp4").write_bytes(b"dummy video content")
+                   ) as mock_advanced:
+            VideoProcessor().concatenate_videos(sequence, str(tmp_path / "output.mp4"),
+                                                progress_callback=progress_callback)
+        
+        if expect_hybrid:
+            mock_advanced.assert_not_called()
+            # フェイド区間のエンコード → concat demuxer によるストリームコピーの順に実行される
+            transition_args, concat_args = captured_args
+            assert transition_args[transition_args.index("-r") + 1] == str(30000 / 1001)
+            assert transition_args[transition_args.index("-s") + 1] == "1920x1080"
+            # SPS/PPSが動画本体と食い違わないよう、libx264で同じプロファイル・レベル・タイムスケールにそろえる
+            assert transition_args[transition_args.index("-vcodec") + 1] == "libx264"
+            assert transition_args[transition_args.index("-profile:v") + 1] == "high"
+            assert transition_args[transition_args.index("-level") + 1] == "4.0"
+            assert transition_args[transition_args.index("-video_track_timescale") + 1] == "30000"
+            assert transition_args[transition_args.index("-x264-params") + 1] == "repeat-headers=1"
+            assert concat_args[concat_args.index("-f") + 1] == "concat"
+            assert concat_args[concat_args.index("-c") + 1] == "copy"
+            # 進捗は最後の連結でのみ通知する
+            assert captured_callbacks == [None, progress_callback]
+        else:
+            assert captured_args == []
+            mock_advanced.assert_called_once()
+        
+        VideoInfo.cache_clear()
+
+    def test_concatenate_videos_parallel(self, monkeypatch):
+        """独立した連結が並列数でコアを分け合って実行されるかのテスト"""
+        monkeypatch.delenv("MOVIE_MIX_FFMPEG_THREADS", raising=False)
+        monkeypatch.setattr("os.cpu_count", lambda: 8)
+        calls = []
+        
+        def fake_concatenate(self, sequence, output_path):
+            calls.append((self.threads, output_path))
+            return VideoInfo(output_path, 5.0)
+        
+        monkeypatch.setattr(VideoProcessor, "concatenate_videos", fake_concatenate)
+        processor = VideoProcessor()
+        sequences = [[VideoSegment(f"{name}.mp4")] for name in ("A", "B", "C")]
+        
+        results = processor.concatenate_videos_parallel(
+            sequences, ["A_out.mp4", "B_out.mp4", "C_out.mp4"], max_workers=2
+        )
+        
+        assert [info.path for info in results] == ["A_out.mp4", "B_out.mp4", "C_out.mp4"]
+        assert sorted(calls) == [(4, "A_out.mp4"), (4, "B_out.mp4"), (4, "C_out.mp4")]
+        assert processor.threads is None
+        
+        with pytest.raises(ValueError):
+            processor.concatenate_videos_parallel(sequences, ["A_out.mp4"])
+    
+    def test_concatenate_videos_batch_single_invocation(self, tmp_path, monkeypatch):
+        """複数の連結が1回のFFmpeg実行にまとめられるかのテスト"""
+        from movie_mix_util import video_processing_lib
+        invocations = []
+        output_paths = [str(tmp_path / "out1.mp4"), str(tmp_path / "out2.mp4")]
+        
+        def capture_run(args, **kwargs):
+            invocations.append(args)
+            for output_path in output_paths:
+                Path(output_path).write_bytes(b"dummy video content")
+        
+        monkeypatch.setattr(video_processing_lib, "run_ffmpeg_args", capture_run)
+        sequences = [
+            [VideoSegment("A.mp4"), Transition(TransitionMode.NONE), VideoSegment("B.mp4")],
+            [VideoSegment("C.mp4"), Transition(TransitionMode.CROSSFADE_INCREASE, 1.0), VideoSegment("D.mp4")],
+        ]
+        
+        with patch('movie_mix_util.advanced_video_concatenator.get_video_duration', return_value=5.0), \
+             patch('movie_mix_util.video_processing_lib.VideoInfo.from_path', side_effect=lambda path: VideoInfo(path, 5.0)):
+            results = VideoProcessor().concatenate_videos_batch(sequences, output_paths)
+        
+        assert len(invocations) == 1
+        args = invocations[0]
+        assert args.count("-i") == 4
+        assert all(output_path in args for output_path in output_paths)
+        assert args[args.index("-map") + 1] == "[o0_concat]"
+        assert [info.path for info in results] == output_paths
+        
+        with pytest.raises(ValueError):
+            VideoProcessor().concatenate_videos_batch(sequences, output_paths[:1])
+    
+    def test_video_processor_encoding_profile(self):
+        """エンコードプロファイル指定テスト"""
+        processor = VideoProcessor(encoding_profile="fast")
+        
+        assert processor.encoding_profile == "fast"
+        
+        with pytest.raises(ValueError):
+            VideoProcessor(encoding_profile="unknown")
+    
+    def test_get_encoding_params_per_encoder(self):
+        """エンコードプロファイルがエンコーダごとのオプションに解決されるかのテスト"""
+        assert get_encoding_params("fast", "libx264") == {"preset": "ultrafast", "tune": "zerolatency"}
+        assert get_encoding_params("fast", "h264_nvenc") == {"preset": "p1", "tune": "ll"}
+        assert get_encoding_params("fast", "h264_videotoolbox") == {}
+        assert get_encoding_params("throughput", "libx264") == {
+            "preset": "veryfast", "tune": "fastdecode", "x264-params": "aq-mode=0"}
+        assert get_encoding_params("throughput", "h264_nvenc") == {}
+        assert get_encoding_params(None, "h264_nvenc") == {}
+    
+    def test_get_x265_params(self):
+        """x265のスレッドプールが指定スレッド数に合わせられるかのテスト"""
+        assert get_x265_params(8) == {"preset": "faster", "x265-params": "wpp=1:frame-threads=8:pools=8"}
+        # フレーム並列数は x265 の上限で打ち切る
+        assert get_x265_params(64)["x265-params"] == "wpp=1:frame-threads=16:pools=64"
+    
     @pytest.mark.requires_ffmpeg
-    def test_get_video_info(self, test_video_short, mock_ffmpeg_probe):
+    def test_get_video_info(self, shared_processor, test_video_short, mock_ffmpeg_probe):
         """動画情報取得テスト"""
-        processor = VideoProcessor()
+        processor = shared_processor
         info = processor.get_video_info(str(test_video_short))
         
         assert isinstance(info, VideoInfo)
         assert info.duration > 0
     
-    def test_create_simple_sequence_basic(self):
+    def test_create_simple_sequence_basic(self, shared_processor):
         """基本的なシーケンス作成テスト"""
-        processor = VideoProcessor()
+        processor = shared_processor
         
         video_paths = ["A.mp4", "B.mp4", "C.mp4"]
         
@@ -120,9 +445,9 @@ class TestVideoProcessor:
         assert isinstance(sequence[2], VideoSegment)
         assert sequence[2].path == "B.mp4"
     
-    def test_create_simple_sequence_with_crossfade(self):
+    def test_create_simple_sequence_with_crossfade(self, shared_processor):
         """クロスフェイド付きシーケンス作成テスト"""
-        processor = VideoProcessor()
+        processor = shared_processor
         
         video_paths = ["A.mp4", "B.mp4"]
         crossfade_durations = [2.0]
@@ -140,28 +465,48 @@ class TestVideoProcessor:
         assert transition.mode == TransitionMode.CROSSFADE_NO_INCREASE
         assert transition.duration == 2.0
     
-    def test_create_simple_sequence_nonexistent_file(self):
+    def test_create_simple_sequence_nonexistent_file(self, shared_processor):
         """存在しないファイルでのエラーテスト"""
-        processor = VideoProcessor()
+        processor = shared_processor
         
         video_paths = ["nonexistent.mp4"]
         
         with pytest.raises(FileNotFoundError):
             processor.create_simple_sequence(video_paths)
     
-    def test_create_simple_sequence_empty_list(self):
+    def test_create_simple_sequence_real_files(self, shared_processor, tmp_path):
+        """実在するファイルは個別のstatなしで確認されるかのテスト"""
+        video_paths = [str(tmp_path / f"{name}.mp4") for name in ("A", "B", "C")]
+        for path in video_paths:
+            Path(path).write_bytes(b"dummy video content")
+        
+        with patch('pathlib.Path.exists', side_effect=AssertionError("個別のstatは不要")):
+            sequence = shared_processor.create_simple_sequence(video_paths)
+        
+        assert [item.path for item in sequence if isinstance(item, VideoSegment)] == video_paths
+        
+        Path(video_paths[1]).unlink()
+        Path(video_paths[2]).unlink()
+        with pytest.raises(FileNotFoundError) as exc_info:
+            shared_processor.create_simple_sequence(video_paths)
+        
+        # 見つからないファイルはまとめて報告される
+        assert video_paths[1] in str(exc_info.value)
+        assert video_paths[2] in str(exc_info.value)
+    
+    def test_create_simple_sequence_empty_list(self, shared_processor):
         """空リストでのエラーテスト"""
-        processor = VideoProcessor()
+        processor = shared_processor
         
         with pytest.raises(ValueError):
             processor.create_simple_sequence([])
     
-    @patch('video_processing_lib.calculate_sequence_duration')
-    def test_calculate_total_duration(self, mock_calc):
+    @patch('movie_mix_util.video_processing_lib.calculate_sequence_duration')
+    def test_calculate_total_duration(self, mock_calc, shared_processor):
         """合計時間計算テスト"""
         mock_calc.return_value = 45.0
         
-        processor = VideoProcessor()
+        processor = shared_processor
         sequence = [VideoSegment("test.mp4")]
         
         duration = processor.calculate_total_duration(sequence)
@@ -170,10 +515,10 @@ class TestVideoProcessor:
     
     @pytest.mark.slow
     @pytest.mark.requires_ffmpeg
-    def test_mix_video_with_image_integration(self, test_video_short, samples_dir, 
+    def test_mix_video_with_image_integration(self, shared_processor, test_video_short, samples_dir, 
                                             temp_output_file, mock_ffmpeg_probe, mock_ffmpeg_run):
         """動画・画像ミックスの統合テスト"""
-        processor = VideoProcessor()
+        processor = shared_processor
         
         result_info = processor.mix_video_with_image(
             str(test_video_short),
@@ -187,6 +532,87 @@ class TestVideoProcessor:
         assert abs(result_info.duration - 3.0) <= 0.2
 
 
+class TestFilterComplexScript:
+    """長いフィルターグラフのスクリプトファイル化のテスト"""
+    
+    def test_long_filter_graph_uses_script(self):
+        """100KBを超えるフィルターグラフはファイル経由で渡されるかのテスト"""
+        filter_graph = ";".join(f"[{i}:v]null[v{i}]" for i in range(10_000))
+        assert len(filter_graph) > 120_000
+        args = ["ffmpeg", "-i", "A.mp4", "-filter_complex", filter_graph, "output.mp4"]
+        
+        new_args, script_path = spill_filter_complex_script(args)
+        try:
+            assert script_path is not None
+            assert "-filter_complex" not in new_args
+            assert new_args[new_args.index("-filter_complex_script") + 1] == script_path
+            assert Path(script_path).read_text() == filter_graph
+            assert new_args[-1] == "output.mp4"
+        finally:
+            Path(script_path).unlink()
+    
+    def test_short_filter_graph_unchanged(self):
+        """短いフィルターグラフはそのままコマンドラインで渡されるかのテスト"""
+        args = ["ffmpeg", "-i", "A.mp4", "-filter_complex", "[0:v]null[v0]", "output.mp4"]
+        
+        assert spill_filter_complex_script(args) == (args, None)
+
+
+class TestFFmpegProgress:
+    """-progress による進捗通知のテスト"""
+    
+    @staticmethod
+    def _fake_process(stderr_lines, returncode=0):
+        return SimpleNamespace(stderr=iter(line.encode() for line in stderr_lines),
+                               wait=Mock(return_value=returncode), kill=Mock())
+    
+    def test_progress_blocks_passed_to_callback(self):
+        """進捗が "progress=" の行ごとにまとめてコールバックに渡されるかのテスト"""
+        stderr_lines = [
+            "Input #0, mov,mp4,m4a,3gp,3g2,mj2, from 'A.mp4':\n",
+            "frame=30\n", "out_time_us=1000000\n", "speed=2.0x\n", "progress=continue\n",
+            "frame=60\n", "out_time_us=2000000\n", "speed=2.1x\n", "progress=end\n",
+        ]
+        progress = []
+        
+        with patch('movie_mix_util.common.subprocess.Popen',
+                   return_value=self._fake_process(stderr_lines)) as mock_popen:
+            run_ffmpeg_args(["ffmpeg", "-i", "A.mp4", "output.mp4"], quiet=True, progress_callback=progress.append)
+        
+        assert mock_popen.call_args[0][0] == ["ffmpeg", "-progress", "pipe:2", "-nostats",
+                                              "-i", "A.mp4", "output.mp4"]
+        assert progress == [
+            {"frame": "30", "out_time_us": "1000000", "speed": "2.0x", "progress": "continue"},
+            {"frame": "60", "out_time_us": "2000000", "speed": "2.1x", "progress": "end"},
+        ]
+    
+    def test_progress_failure_raises_with_log(self):
+        """異常終了時に進捗以外のログが ffmpeg.Error に含まれるかのテスト"""
+        import ffmpeg
+        stderr_lines = ["progress=end\n", "A.mp4: No such file or directory\n"]
+        
+        with patch('movie_mix_util.common.subprocess.Popen',
+                   return_value=self._fake_process(stderr_lines, returncode=1)):
+            with pytest.raises(ffmpeg.Error) as exc_info:
+                run_ffmpeg_args(["ffmpeg", "-i", "A.mp4", "output.mp4"], quiet=True, progress_callback=lambda p: None)
+        
+        assert exc_info.value.stderr == b"A.mp4: No such file or directory\n"
+    
+    def test_progress_callback_error_kills_ffmpeg(self):
+        """コールバックが例外を送出した場合にFFmpegを終了させてから例外を伝えるかのテスト"""
+        process = self._fake_process(["frame=30\n", "progress=continue\n", "frame=60\n", "progress=end\n"])
+        
+        def failing_callback(progress):
+            raise RuntimeError("callback failed")
+        
+        with patch('movie_mix_util.common.subprocess.Popen', return_value=process):
+            with pytest.raises(RuntimeError, match="callback failed"):
+                run_ffmpeg_args(["ffmpeg", "-i", "A.mp4", "output.mp4"], quiet=True, progress_callback=failing_callback)
+        
+        process.kill.assert_called_once()
+        process.wait.assert_called_once()
+
+
 class TestVideoSequenceBuilder:
     """VideoSequenceBuilderクラスのテスト"""
     
@@ -303,17 +729,31 @@ class TestVideoSequenceBuilder:
         # 異なるオブジェクトであることを確認
         assert sequence1 is not sequence2
         assert sequence1 == sequence2  # 内容は同じ
+    
+    def test_builder_large_sequence(self):
+        """大量の要素を持つシーケンスの構築テスト"""
+        builder = VideoSequenceBuilder()
+        
+        for i in range(10_000):
+            builder.add_video(f"video_{i}.mp4").add_crossfade(0.5)
+        sequence = builder.build()
+        
+        assert len(sequence) == 20_000
+        assert sequence[0] == VideoSegment("video_0.mp4")
+        assert sequence[-2] == VideoSegment("video_9999.mp4")
+        assert sequence[-1] == Transition(TransitionMode.CROSSFADE_INCREASE, 0.5)
 
 
 class TestQuickFunctions:
     """便利関数のテスト"""
     
-    @patch('video_processing_lib.VideoProcessor')
+    @patch('movie_mix_util.video_processing_lib.VideoProcessor')
     def test_quick_concatenate_basic(self, mock_processor_class):
         """クイック連結の基本テスト"""
-        mock_processor = MagicMock()
-        mock_processor.create_simple_sequence.return_value = [VideoSegment("test.mp4")]
-        mock_processor.concatenate_videos.return_value = VideoInfo("output.mp4", 10.0)
+        mock_processor = SimpleNamespace(
+            create_simple_sequence=Mock(return_value=[VideoSegment("test.mp4")]),
+            concatenate_videos=Mock(return_value=VideoInfo("output.mp4", 10.0))
+        )
         mock_processor_class.return_value = mock_processor
         
         result = quick_concatenate(
@@ -340,11 +780,12 @@ class TestQuickFunctions:
         assert isinstance(result, VideoInfo)
         assert result.duration == 10.0
     
-    @patch('video_processing_lib.VideoProcessor')
+    @patch('movie_mix_util.video_processing_lib.VideoProcessor')
     def test_quick_mix_basic(self, mock_processor_class):
         """クイックミックスの基本テスト"""
-        mock_processor = MagicMock()
-        mock_processor.mix_video_with_image.return_value = VideoInfo("output.mp4", 30.0)
+        mock_processor = SimpleNamespace(
+            mix_video_with_image=Mock(return_value=VideoInfo("output.mp4", 30.0))
+        )
         mock_processor_class.return_value = mock_processor
         
         result = quick_mix(
@@ -409,7 +850,7 @@ class TestIntegrationScenarios:
         assert len(sequence) == 5
         
         # 時間計算（モック使用）
-        with patch('video_processing_lib.calculate_sequence_duration') as mock_calc:
+        with patch('movie_mix_util.video_processing_lib.calculate_sequence_duration') as mock_calc:
             mock_calc.return_value = 120.0
             
             total_duration = processor.calculate_total_duration(sequence)
@@ -417,6 +858,41 @@ class TestIntegrationScenarios:
         
         print("✅ エンドツーエンドワークフローテスト成功")
     
+    def test_build_pipeline_single_invocation(self, shared_processor, samples_dir):
+        """連結とオーバーレイが1つのFFmpegコマンドにまとめられるかのテスト"""
+        processor = shared_processor
+        sequence = [VideoSegment("A.mp4"), Transition(TransitionMode.NONE), VideoSegment("B.mp4")]
+        
+        with patch('movie_mix_util.advanced_video_concatenator.get_video_duration', return_value=5.0):
+            args = processor.build_pipeline(
+                sequence, "output.mp4", overlay_image=str(samples_dir / "02-1.png"), duration=8
+            )
+        
+        assert args[0] == "ffmpeg"
+        assert args.count("-i") == 3  # 動画2本 + 画像1枚
+        filter_graph = args[args.index("-filter_complex") + 1]
+        assert "concat=" in filter_graph
+        assert "overlay=" in filter_graph
+        assert args[args.index("-t") + 1] == "8"
+        assert "output.mp4" in args
+    
+    def test_build_pipeline_cuda_overlay(self, samples_dir):
+        """CUDA指定時にオーバーレイがGPU上で合成され、NVENCへそのまま渡されるかのテスト"""
+        processor = VideoProcessor(hw_accel="cuda")
+        sequence = [VideoSegment("A.mp4"), Transition(TransitionMode.NONE), VideoSegment("B.mp4")]
+        
+        with patch('movie_mix_util.advanced_video_concatenator.get_video_duration', return_value=5.0):
+            args = processor.build_pipeline(sequence, "output.mp4", overlay_image=str(samples_dir / "02-1.png"))
+        
+        filter_graph = args[args.index("-filter_complex") + 1]
+        assert "overlay_cuda=eof_action=repeat:" in filter_graph
+        assert filter_graph.count("hwupload_cuda") == 2
+        # 静止画は1fpsで入力し、アップロードも1秒に1回で済ませる
+        assert args[args.index("-framerate") + 1] == "1"
+        assert args[args.index("-vcodec") + 1] == "h264_nvenc"
+        assert "-pix_fmt" not in args
+        assert args[args.index("-filter_hw_device") + 1] == "cu"
+    
     @pytest.mark.integration
     def test_complex_sequence_scenarios(self, mock_ffmpeg_probe, mock_ffmpeg_run):
         """複雑なシーケンスシナリオテスト"""